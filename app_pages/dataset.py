@@ -0,0 +1,3 @@
+import dashboard
+
+dashboard.show_dataset_page()
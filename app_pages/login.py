@@ -0,0 +1,68 @@
+import streamlit as st
+from auth import register_user, login_user
+
+st.markdown('<div style="text-align: center; padding: 2rem 0;">🔐</div>', unsafe_allow_html=True)
+
+with st.container():
+    st.markdown('<div class="login-container">', unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["Login", "Register"])
+    
+    with tab1:
+        st.markdown('''
+        <div class="login-header">
+            <div class="login-title">Welcome Back</div>
+            <div class="login-subtitle">Enter your credentials to access your account</div>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        login_username = st.text_input("Username", key="login_username", placeholder="Enter your username")
+        login_password = st.text_input("Password", type="password", key="login_password", placeholder="Enter your password")
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col2:
+            if st.button("Sign In", key="login_btn"):
+                if login_username and login_password:
+                    success, message = login_user(login_username, login_password)
+                    if success:
+                        st.session_state.logged_in = True
+                        st.session_state.username = login_username
+                        st.rerun()
+                    else:
+                        st.markdown(f'<div class="error-message">{message}</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown('<div class="error-message">Please fill all fields</div>', unsafe_allow_html=True)
+    
+    with tab2:
+        st.markdown('''
+        <div class="login-header">
+            <div class="login-title">Create Account</div>
+            <div class="login-subtitle">Sign up to get started</div>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        reg_username = st.text_input("Username", key="reg_username", placeholder="Choose a username")
+        reg_email = st.text_input("Email", key="reg_email", placeholder="Enter your email")
+        reg_password = st.text_input("Password", type="password", key="reg_password", placeholder="Create a password")
+        reg_confirm = st.text_input("Confirm Password", type="password", key="reg_confirm", placeholder="Confirm your password")
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col2:
+            if st.button("Sign Up", key="register_btn"):
+                if reg_username and reg_email and reg_password and reg_confirm:
+                    if reg_password != reg_confirm:
+                        st.markdown('<div class="error-message">Passwords do not match</div>', unsafe_allow_html=True)
+                    elif len(reg_password) < 6:
+                        st.markdown('<div class="error-message">Password must be at least 6 characters</div>', unsafe_allow_html=True)
+                    else:
+                        success, message = register_user(reg_username, reg_email, reg_password)
+                        if success:
+                            st.markdown(f'<div class="success-message">{message}</div>', unsafe_allow_html=True)
+                        else:
+                            st.markdown(f'<div class="error-message">{message}</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown('<div class="error-message">Please fill all fields</div>', unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
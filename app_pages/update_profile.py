@@ -0,0 +1,3 @@
+import dashboard
+
+dashboard.show_update_profile_page()
@@ -0,0 +1,3 @@
+import dashboard
+
+dashboard.show_user_data_page()
@@ -0,0 +1,114 @@
+import time
+import streamlit as st
+from user_store import UserExistsError
+from services import store, get_password_hasher, login_limiter, views
+
+def client_ip():
+    """Best-effort client address, from X-Forwarded-For only when behind a trusted proxy"""
+    if st.secrets.get("TRUST_FORWARDED_FOR", False):
+        forwarded = st.context.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return st.context.ip_address
+
+def hash_password(password):
+    """Hash password using salted scrypt"""
+    return get_password_hasher().hash(password)
+
+def register_user(username, email, password):
+    """Register new user in the user store"""
+    try:
+        # Insert new user, the unique username key rejects duplicates
+        data = {
+            'username': username,
+            'email': email,
+            'password': hash_password(password)
+        }
+        
+        store.insert_user(data)
+        views.refresh('user_stats')
+        return True, "Registration successful!"
+        
+    except UserExistsError:
+        return False, "Username already exists"
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+# How long a session may reuse a fetched profile before asking the store again
+PROFILE_CACHE_TTL = 60
+
+def cache_user_profile(username, user):
+    """Remember a fetched profile row for this session"""
+    st.session_state.setdefault('profile_cache', {})[username] = (time.monotonic(), user)
+
+def invalidate_user_profile(username):
+    """Drop the cached profile for username so the next read hits the store"""
+    st.session_state.get('profile_cache', {}).pop(username, None)
+
+# Columns of the profile row cached per session
+PROFILE_COLUMNS = ['email', 'created_at', 'password']
+
+def cached_user_profile(username):
+    """The session's cached profile for username if still fresh, without asking the store"""
+    entry = st.session_state.get('profile_cache', {}).get(username)
+    if entry and time.monotonic() - entry[0] < PROFILE_CACHE_TTL:
+        return entry[1]
+    return None
+
+def get_user_profile(username):
+    """Get email, created_at and password hash, cached per session for PROFILE_CACHE_TTL seconds"""
+    user = cached_user_profile(username)
+    if user:
+        return user
+    
+    user = store.get_user(username, PROFILE_COLUMNS)
+    if user:
+        cache_user_profile(username, user)
+    return user
+
+def login_user(username, password):
+    """Authenticate user against the user store"""
+    # Throttled attempts are turned away before any query or hash is spent on them
+    allowed, retry_after = login_limiter.check(username, client_ip())
+    if not allowed:
+        return False, f"Too many sign-in attempts. Please try again in {int(retry_after) + 1} seconds."
+    
+    try:
+        # Query user by username, fetching the profile in the same round trip
+        user = store.get_user(username, ['email', 'created_at', 'password'])
+        
+        if user is None:
+            return False, "Username not found"
+        
+        stored_password = user['password']
+        
+        hasher = get_password_hasher()
+        if hasher.verify(password, stored_password):
+            login_limiter.succeeded(username)
+            cache_user_profile(username, user)
+
+            # Upgrade legacy or outdated hashes without slowing down this login
+            if hasher.needs_rehash(stored_password):
+                hasher.rehash_in_background(
+                    password,
+                    lambda new_hash: store.update_user(username, {'password': new_hash}, expected={'password': stored_password})
+                )
+            return True, "Login successful!"
+        
+        return False, "Incorrect password"
+        
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+def get_user_info(username):
+    """Get user information from the session profile cache or the user store"""
+    try:
+        user = get_user_profile(username)
+        
+        if user:
+            return (user['email'], user['created_at'])
+        return None
+        
+    except Exception as e:
+        st.error(f"Error fetching user info: {str(e)}")
+        return None
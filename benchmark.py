@@ -0,0 +1,268 @@
+"""Headless benchmark for the dashboard pages and the sign-in paths.
+
+Each scenario runs test.py under Streamlit's AppTest in a fresh subprocess,
+so cached resources and peak RSS are measured per scenario. Two sweeps are
+run: dataset sizes (pages backed by a generated Parquet file) and user table
+sizes (a pre-seeded SQLite user store).
+
+    python benchmark.py                                  # full sweep
+    python benchmark.py --dataset-rows 1000 100000 --user-rows 10 1000 --repeats 5
+    python benchmark.py --save-baseline                  # record bench_baseline.json
+    python benchmark.py --store memory --latency-ms 20   # in-memory backend with simulated RTT
+
+The run exits non-zero when an operation's p50 or a scenario's peak RSS is
+worse than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.py')
+PAGES = ['charts', 'dataset', 'users', 'update_profile']
+BENCH_USER, BENCH_PASSWORD = 'bench_user', 'bench-password'
+# Noise floor: differences smaller than this never count as a regression
+MIN_REGRESSION_MS = 5.0
+
+
+def percentile(samples, q):
+    return float(np.percentile(samples, q)) if samples else float('nan')
+
+
+def dataset_file(data_dir, rows):
+    """Parquet file with rows synthetic sales rows, generated once and reused"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from data_source import normalize_chunk
+
+    path = os.path.join(data_dir, f'sales-{rows}.parquet')
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(42)
+    writer = None
+    tmp_path = path + '.tmp'
+    try:
+        for start in range(0, rows, 1_000_000):
+            n = min(1_000_000, rows - start)
+            chunk = normalize_chunk(pd.DataFrame({
+                'Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365, n), unit='D'),
+                'Sales': rng.uniform(1000, 6000, n),
+                'Profit': rng.uniform(200, 2300, n),
+                'Customers': rng.integers(50, 300, n),
+                'Category': rng.choice(['Electronics', 'Clothing', 'Food', 'Books'], n),
+                'Region': rng.choice(['North', 'South', 'East', 'West'], n),
+                'Satisfaction': rng.uniform(3.5, 5.0, n),
+            }))
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def seed_users(path, count):
+    """SQLite user store pre-filled with count users sharing one password hash"""
+    from passwords import PasswordHasher
+    from user_store import SQLiteUserStore
+
+    SQLiteUserStore(path)
+    password = PasswordHasher(n=2 ** 10).hash('seeded-password')
+    started = pd.Timestamp('2024-01-01')
+    conn = sqlite3.connect(path)
+    with conn:
+        for offset in range(0, count, 100_000):
+            batch = range(offset, min(count, offset + 100_000))
+            conn.executemany(
+                'INSERT INTO users (username, email, password, created_at) VALUES (?, ?, ?, ?)',
+                (
+                    (f'user{i:07d}', f'user{i:07d}@example.com', password,
+                     (started + pd.Timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S'))
+                    for i in batch
+                )
+            )
+    conn.close()
+
+
+def run_scenario(spec):
+    """Drive the app through sign-up, sign-in and every page; return timings in ms"""
+    from streamlit.testing.v1 import AppTest
+
+    work_dir = tempfile.mkdtemp(prefix='bench-')
+    at = AppTest.from_file(APP, default_timeout=spec['timeout'])
+    at.secrets.update({
+        'USER_STORE': spec['store'],
+        'DATASET_CACHE_DIR': os.path.join(work_dir, 'datasets'),
+        'PASSWORD_HASH_BUDGET_MS': spec['hash_budget_ms'],
+        # Repeated sign-ins from one client must not trip the rate limiter
+        'LOGIN_ATTEMPTS_PER_USERNAME': 10 ** 6,
+        'LOGIN_ATTEMPTS_PER_IP': 10 ** 6,
+    })
+    if spec['store'] == 'sqlite':
+        db_path = os.path.join(work_dir, 'users.db')
+        seed_users(db_path, spec['users'])
+        at.secrets['SQLITE_PATH'] = db_path
+    else:
+        at.secrets['MEMORY_STORE_LATENCY_MS'] = spec['latency_ms']
+    if spec['dataset_path']:
+        at.secrets['DATA_SOURCE'] = spec['dataset_path']
+
+    def timed_run():
+        started = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return elapsed
+
+    def fill(**values):
+        for widget in at.text_input:
+            if widget.key in values:
+                widget.input(values[widget.key])
+
+    timings = {}
+    timings['startup'] = [timed_run()]
+
+    timings['register'] = []
+    for i in range(spec['repeats']):
+        username = BENCH_USER if i == 0 else f'{BENCH_USER}_{i}'
+        fill(reg_username=username, reg_email=f'{username}@example.com',
+             reg_password=BENCH_PASSWORD, reg_confirm=BENCH_PASSWORD)
+        at.button(key='register_btn').click()
+        timings['register'].append(timed_run())
+
+    timings['login'] = []
+    for _ in range(spec['repeats']):
+        at.session_state['logged_in'] = False
+        at.run()
+        fill(login_username=BENCH_USER, login_password=BENCH_PASSWORD)
+        at.button(key='login_btn').click()
+        timings['login'].append(timed_run())
+        if not at.session_state['logged_in']:
+            raise RuntimeError("Benchmark user could not sign in")
+
+    # The first render of each page builds its caches and is reported separately
+    for name in PAGES:
+        at.switch_page(f'app_pages/{name}.py')
+        timings[f'{name}_cold'] = [timed_run()]
+        timings[name] = [timed_run() for _ in range(spec['repeats'])]
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'timings': timings, 'peak_rss_mb': peak_rss_mb}
+
+
+def scenarios(args):
+    """Dataset-size sweep at the smallest user table, then user-table sweep on the sample data"""
+    base = {
+        'store': args.store, 'latency_ms': args.latency_ms, 'repeats': args.repeats,
+        'hash_budget_ms': args.hash_budget_ms, 'timeout': args.timeout,
+    }
+    users = min(args.user_rows)
+    for rows in args.dataset_rows:
+        yield f'{args.store} dataset={rows:,} users={users:,}', {
+            **base, 'users': users, 'dataset_path': dataset_file(args.data_dir, rows),
+        }
+    if args.store != 'sqlite':
+        return
+    for count in args.user_rows:
+        yield f'{args.store} dataset=sample users={count:,}', {**base, 'users': count, 'dataset_path': None}
+
+
+def summarize(result):
+    return {
+        'peak_rss_mb': result['peak_rss_mb'],
+        'ops': {
+            op: {'p50_ms': percentile(samples, 50), 'p95_ms': percentile(samples, 95), 'n': len(samples)}
+            for op, samples in result['timings'].items()
+        },
+    }
+
+
+def regressions(label, summary, baseline, tolerance):
+    """Lines describing where summary is worse than its baseline entry"""
+    previous = baseline.get(label)
+    if not previous:
+        return []
+    found = []
+    for op, stats in summary['ops'].items():
+        before = previous['ops'].get(op)
+        if before is None:
+            continue
+        if stats['p50_ms'] - before['p50_ms'] > max(MIN_REGRESSION_MS, before['p50_ms'] * tolerance):
+            found.append(f"{label} {op}: p50 {before['p50_ms']:.1f} -> {stats['p50_ms']:.1f} ms")
+    if summary['peak_rss_mb'] > previous['peak_rss_mb'] * (1 + tolerance):
+        found.append(f"{label} peak RSS: {previous['peak_rss_mb']:.0f} -> {summary['peak_rss_mb']:.0f} MB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dataset-rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--user-rows', type=int, nargs='+', default=[10, 1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeats', type=int, default=10, help='warm runs per operation')
+    parser.add_argument('--store', choices=['sqlite', 'memory'], default='sqlite',
+                        help='user backend; the in-memory stand-in skips the user-table sweep')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated round trip for --store memory')
+    parser.add_argument('--hash-budget-ms', type=float, default=250.0)
+    parser.add_argument('--timeout', type=float, default=900.0, help='per script run, in seconds')
+    parser.add_argument('--data-dir', default=os.path.join('.cache', 'bench'))
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown, as a fraction')
+    parser.add_argument('--output', help='also write the results as JSON to this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(json.loads(args.worker))))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results, found = {}, []
+    for label, spec in scenarios(args):
+        print(f'== {label}', flush=True)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', json.dumps(spec)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            found.append(f'{label}: scenario failed')
+            continue
+        summary = summarize(json.loads(proc.stdout.strip().splitlines()[-1]))
+        results[label] = summary
+        for op, stats in summary['ops'].items():
+            print(f"   {op:<22} p50 {stats['p50_ms']:9.1f} ms   p95 {stats['p95_ms']:9.1f} ms   n={stats['n']}")
+        print(f"   {'peak RSS':<22} {summary['peak_rss_mb']:9.0f} MB", flush=True)
+        found += regressions(label, summary, baseline, args.tolerance)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({**baseline, **results}, f, indent=2)
+        print(f'Baseline written to {args.baseline}')
+    elif baseline:
+        print('\n'.join(['', 'Regressions:', *found]) if found else '\nNo regressions against baseline.')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
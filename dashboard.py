@@ -0,0 +1,777 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from user_store import UserExistsError, page_cursor
+from services import profiler, store, get_password_hasher, fetch_pool, login_limiter, views, VIEW_WAIT_SECONDS
+from auth import PROFILE_COLUMNS, cached_user_profile, invalidate_user_profile, get_user_info
+from metrics import (
+    dataset_version, compute_kpis, sales_trend_figure_json,
+    category_pie_figure_json, figure_from_json, period_deltas
+)
+from downsample import target_points
+from data_source import open_data_source, normalize_chunk, memory_footprint
+from disk_cache import DatasetDiskCache
+from shared_cache import open_shared_cache, use_shared_cache
+from filters import FilterIndex
+from rollup import RollupCube, means
+from refresh import LiveDataset
+from scheduler import ViewFailed
+from table_view import render_table
+from exports import EXPORT_FORMATS, export_stream, iter_frame_batches, iter_user_batches
+
+# Dashboard pages and their data. Everything heavy (pandas, NumPy, Plotly,
+# Arrow) is imported from here, and test.py only imports this module once a
+# user has signed in.
+
+@st.cache_resource
+def init_dataset_cache():
+    """On-disk Arrow cache for datasets, shared across restarts and replicas (None if disabled)"""
+    directory = st.secrets.get("DATASET_CACHE_DIR", ".cache/datasets")
+    return DatasetDiskCache(directory) if directory else None
+
+@st.cache_resource
+def init_shared_cache():
+    """Cache tier for aggregates shared by every replica: a directory or sqlite:///path (None if disabled)"""
+    spec = st.secrets.get("SHARED_CACHE", ".cache/shared")
+    backend = open_shared_cache(spec, max_bytes=int(st.secrets.get("SHARED_CACHE_MAX_MB", 512)) * 1024 ** 2) if spec else None
+    use_shared_cache(backend)
+    return backend
+
+init_shared_cache()
+
+def cached_on_disk(identity, build):
+    """Read a dataset from the disk cache, building and storing it on a miss"""
+    cache = init_dataset_cache()
+    if cache is None:
+        return build()
+    return cache.load_or_build(identity, build)
+
+# Generate sample data. Datasets are cached as shared resources rather than with
+# st.cache_data, so every session reads the same compact frame instead of
+# unpickling its own copy; treat them as read-only.
+@st.cache_resource
+def generate_sample_data():
+    return cached_on_disk('sample-data:seed=42', build_sample_data)
+
+@profiler.timed('data.build_sample', measure_result=True)
+def build_sample_data():
+    np.random.seed(42)
+    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
+    df = pd.DataFrame({
+        'Date': dates,
+        'Sales': np.random.randint(1000, 5000, len(dates)) + np.linspace(1000, 3000, len(dates)),
+        'Profit': np.random.randint(200, 1500, len(dates)) + np.linspace(200, 800, len(dates)),
+        'Customers': np.random.randint(50, 300, len(dates)),
+        'Category': np.random.choice(['Electronics', 'Clothing', 'Food', 'Books'], len(dates)),
+        'Region': np.random.choice(['North', 'South', 'East', 'West'], len(dates)),
+        'Satisfaction': np.random.uniform(3.5, 5.0, len(dates))
+    })
+    return normalize_chunk(df)
+
+@st.cache_data
+def sample_data_version():
+    """Content hash of the sample dataset, computed once per process"""
+    return dataset_version(generate_sample_data())
+
+@st.cache_resource
+def init_data_source():
+    """Open the configured data source, or None to use the generated sample data"""
+    spec = st.secrets.get("DATA_SOURCE")
+    if not spec:
+        return None
+    return open_data_source(spec, table=st.secrets.get("DATA_TABLE", "sales"))
+
+@st.cache_resource(max_entries=2, show_spinner="Loading dataset...")
+def load_source_data(_source, identity):
+    """Load the data source once per identity (file mtime, ETag, table fingerprint)"""
+    return cached_on_disk(identity, _source.load)
+
+@st.cache_resource
+def init_live_dataset():
+    """Load the data source once and append newer rows on a background interval (None if disabled)"""
+    source = init_data_source()
+    interval = float(st.secrets.get("DATA_REFRESH_SECONDS", 0))
+    if source is None or interval <= 0:
+        return None
+    identity = source.identity()
+    live = LiveDataset(source, cached_on_disk(identity, source.load), identity)
+    live.start(interval)
+    return live
+
+@profiler.timed('data.load')
+def load_dataset():
+    """Return the dashboard dataset and the version string its derived caches are keyed by"""
+    live = init_live_dataset()
+    if live is not None:
+        df, cube, version = live.snapshot()
+        return df, version
+    source = init_data_source()
+    if source is None:
+        return generate_sample_data(), sample_data_version()
+    identity = source.identity()
+    return load_source_data(source, identity), identity
+
+def export_download_button(label, make_batches, file_stem, key):
+    """Render a format picker and a download button that builds the file only when clicked"""
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key=f"{key}_format", label_visibility="collapsed")
+    
+    extension, mime = EXPORT_FORMATS[fmt]
+    
+    with col2:
+        st.download_button(
+            label=label,
+            data=lambda: export_stream(make_batches(), fmt),
+            file_name=f'{file_stem}.{extension}',
+            mime=mime,
+            key=key
+        )
+
+def format_delta(value, unit='%'):
+    """Render a metric-delta line for a change computed by period_deltas"""
+    if value is None:
+        return '<div class="metric-delta neutral">No previous period</div>'
+    arrow, css = ('↑', '') if value >= 0 else ('↓', ' negative')
+    amount = f"{abs(value):.1f}%" if unit == '%' else f"{abs(value):.2f}"
+    return f'<div class="metric-delta{css}">{arrow} {amount} from last period</div>'
+
+# Comparison windows for the dashboard deltas, in days
+DELTA_PERIODS = [7, 30, 90]
+
+# The Sales Trend chart fills half of the wide layout; points beyond what that
+# width can display are dropped server side before serialization
+SALES_TREND_WIDTH_PX = 800
+SALES_TREND_WEBGL_THRESHOLD = 5000
+
+@st.cache_resource(max_entries=2)
+def build_rollup_cube(_df, version):
+    """Category x Region x day/week/month rollup of the dataset, shared by all sessions"""
+    return RollupCube(_df)
+
+def dataset_cube(df, version):
+    """Rollup cube for (df, version), kept up to date in place when live refresh is on"""
+    live = init_live_dataset()
+    if live is not None:
+        _, cube, live_version = live.snapshot()
+        if live_version == version:
+            return cube
+    return build_rollup_cube(df, version)
+
+# Dataset Explorer table: rows per page, and the largest table the gradient
+# is applied to in "All rows" mode
+DATASET_PAGE_ROWS = 1000
+DATASET_MAX_STYLED_ROWS = int(st.secrets.get("DATASET_MAX_STYLED_ROWS", 10_000))
+DATASET_GRADIENT_COLUMNS = ['Sales', 'Profit']
+
+@st.cache_resource(max_entries=2)
+def build_filter_index(_df, version):
+    """Date-sorted filter index for the Dataset Explorer, shared by all sessions"""
+    return FilterIndex(_df)
+
+def publish_dataset(df, cube, version):
+    """Hand the dataset a page loaded to the view scheduler"""
+    views.publish('dataset', (df, cube, version))
+
+# The scheduler thread has no script run, so its views work on the published
+# dataset and never call load_dataset() or other st.cache_* functions
+
+def published_dataset_version():
+    dataset = views.published('dataset')
+    return dataset[2] if dataset is not None else None
+
+def precompute_category_pie():
+    _, cube, version = views.published('dataset')
+    return category_pie_figure_json(cube, version)
+
+def precompute_table_scales():
+    """Gradient scales of the unfiltered Dataset Explorer table"""
+    df, _, _ = views.published('dataset')
+    return {column: (float(df[column].min()), float(df[column].max())) for column in DATASET_GRADIENT_COLUMNS}
+
+# Views the scheduler keeps ready off the request path, rebuilt whenever a
+# page publishes a new dataset version
+views.register('category_pie', profiler.timed('view.category_pie')(precompute_category_pie), version=published_dataset_version)
+views.register('table_scales', profiler.timed('view.table_scales')(precompute_table_scales), version=published_dataset_version)
+
+def latest_view(name):
+    """Latest snapshot of a precomputed view, waiting briefly for the first one after a cold start.
+
+    Raises ViewFailed at once when there is no snapshot because the view's
+    computation is failing, e.g. the user store is down.
+    """
+    return views.latest(name) or views.wait(name, VIEW_WAIT_SECONDS)
+
+def format_age(snapshot):
+    """How long ago a view snapshot was computed, for a staleness caption"""
+    seconds = snapshot.age
+    if seconds < 5:
+        return "just now"
+    if seconds < 120:
+        return f"{seconds:.0f}s ago"
+    return f"{seconds / 60:.0f} min ago"
+
+# Dashboard Pages
+@profiler.timed('page.charts')
+def show_charts_page():
+    st.markdown('<div class="main-header">📊 Analytics Dashboard</div>', unsafe_allow_html=True)
+    st.markdown('<p style="color: #666; margin-bottom: 2rem;">Overview of key metrics and performance indicators</p>', unsafe_allow_html=True)
+    
+    df, version = load_dataset()
+    with profiler.span('charts.aggregates'):
+        cube = dataset_cube(df, version)
+        kpis = compute_kpis(cube, version)
+    publish_dataset(df, cube, version)
+    
+    show_kpi_cards(cube, version, kpis)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Charts, built once per dataset version and reused from their cached JSON
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        with profiler.span('charts.sales_trend_json') as span:
+            fig_sales = figure_from_json(span.record(sales_trend_figure_json(
+                df, version, target_points(SALES_TREND_WIDTH_PX), SALES_TREND_WEBGL_THRESHOLD
+            )))
+        with profiler.span('charts.sales_trend_render'):
+            st.plotly_chart(fig_sales, use_container_width=True)
+    
+    with col2:
+        # Built by the view scheduler; an older snapshot is shown until the
+        # one for this dataset version is ready
+        try:
+            pie = latest_view('category_pie')
+        except ViewFailed as e:
+            st.error(f"Error building the category breakdown: {str(e)}")
+        else:
+            if pie is None:
+                st.info("Preparing the category breakdown…")
+            else:
+                with profiler.span('charts.category_pie_render'):
+                    st.plotly_chart(figure_from_json(pie.value), use_container_width=True)
+                st.caption(f"Updated {format_age(pie)}" + ("" if pie.version == version else " · refreshing"))
+
+# Changing the comparison period reruns only the KPI cards, not the charts
+@st.fragment
+def show_kpi_cards(cube, version, kpis):
+    col1, col2 = st.columns([3, 1])
+    
+    with col2:
+        period_days = st.selectbox(
+            "Compare period",
+            DELTA_PERIODS,
+            index=1,
+            format_func=lambda days: f"Last {days} days vs previous",
+            key="delta_period"
+        )
+    
+    with profiler.span('charts.deltas'):
+        deltas = period_deltas(cube, version, period_days)
+    
+    # Metrics row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">💰 Total Sales</div>
+            <div class="metric-value">${kpis['total_sales']:,.0f}</div>
+            {format_delta(deltas['sales_pct'])}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">💎 Total Profit</div>
+            <div class="metric-value">${kpis['total_profit']:,.0f}</div>
+            {format_delta(deltas['profit_pct'])}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">👥 Avg Customers</div>
+            <div class="metric-value">{kpis['avg_customers']:.0f}</div>
+            {format_delta(deltas['customers_pct'])}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">⭐ Satisfaction</div>
+            <div class="metric-value">{kpis['avg_satisfaction']:.2f}/5.0</div>
+            {format_delta(deltas['satisfaction_diff'], unit='')}
+        </div>
+        """, unsafe_allow_html=True)
+
+# Sort choices for the Registered Users table: label -> (column, descending)
+USER_SORT_OPTIONS = {
+    "Newest first": ('created_at', True),
+    "Oldest first": ('created_at', False),
+    "Username (A-Z)": ('username', False),
+    "Username (Z-A)": ('username', True),
+}
+USER_PAGE_SIZES = [25, 50, 100, 250]
+
+@profiler.timed('page.users')
+def show_user_data_page():
+    st.markdown('<div class="main-header">👥 Registered Users</div>', unsafe_allow_html=True)
+    st.markdown('<p style="color: #666; margin-bottom: 2rem;">View all registered users in the system</p>', unsafe_allow_html=True)
+    
+    show_user_listing()
+
+# Paging and sorting rerun only the listing. The user count and latest
+# registration come from the view scheduler; only the page itself is queried.
+@st.fragment
+def show_user_listing():
+    try:
+        # The table controls are rendered further down, but their values are
+        # needed before the queries run
+        page_size = st.session_state.get("users_page_size", USER_PAGE_SIZES[1])
+        sort_label = st.session_state.get("users_sort", next(iter(USER_SORT_OPTIONS)))
+        sort_by, descending = USER_SORT_OPTIONS[sort_label]
+        
+        # Keyset pagination: remember the cursor each visited page starts
+        # after, and start over whenever the ordering or page size changes
+        if st.session_state.get('users_page_key') != (sort_label, page_size):
+            st.session_state.users_page_key = (sort_label, page_size)
+            st.session_state.users_page_cursors = [None]
+        cursors = st.session_state.users_page_cursors
+        page = len(cursors) - 1
+        
+        stats = latest_view('user_stats')
+        if stats is None:
+            st.info("User statistics are still being prepared, please check back in a moment.")
+            return
+        total_users, latest_user = stats.value
+        
+        # Through the shared pool for its per-call timeout and the cap on
+        # backend calls in flight
+        users, = fetch_pool.run(
+            lambda: store.list_users_page(
+                ['id', 'username', 'email', 'created_at'],
+                sort_by=sort_by,
+                descending=descending,
+                after=cursors[-1],
+                limit=page_size
+            )
+        )
+        
+        if total_users:
+            latest_user = latest_user or "N/A"
+            
+            # Display metrics
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">👥 Total Users</div>
+                    <div class="metric-value">{total_users:,}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">🆕 Latest User</div>
+                    <div style="font-size: 1.2rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                        {latest_user}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">📊 Active Session</div>
+                    <div style="font-size: 1.2rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                        {st.session_state.username}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            attempts = login_limiter.counters()
+            st.caption(
+                f"Counts updated {format_age(stats)}. "
+                f"Sign-in attempts since startup: {attempts['allowed']:,} allowed, "
+                f"{attempts['rejected_ip']:,} rejected per IP, "
+                f"{attempts['rejected_username']:,} rejected per account"
+            )
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("### 📋 User Database")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.selectbox("Rows per page", USER_PAGE_SIZES, index=1, key="users_page_size")
+            
+            with col2:
+                st.selectbox("Sort by", list(USER_SORT_OPTIONS), key="users_sort")
+            
+            df_users = pd.DataFrame(users)
+            
+            # Format the created_at column
+            if 'created_at' in df_users.columns:
+                df_users['created_at'] = pd.to_datetime(df_users['created_at']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Display users table
+            st.dataframe(
+                df_users,
+                use_container_width=True,
+                height=500,
+                hide_index=True
+            )
+            
+            # The count may lag behind the table by a refresh interval
+            total_pages = max(1, -(-total_users // page_size), page + 1)
+            has_next = len(users) == page_size
+            
+            col1, col2, col3 = st.columns([1, 2, 1])
+            
+            with col1:
+                # Callbacks move the cursor before the listing reruns, so the
+                # click renders the new page in a single run
+                st.button("⬅️ Previous", key="users_prev", disabled=page == 0, use_container_width=True, on_click=cursors.pop)
+            
+            with col2:
+                st.markdown(f'<p style="text-align: center; color: #666;">Page {page + 1} of {total_pages}</p>', unsafe_allow_html=True)
+            
+            with col3:
+                st.button(
+                    "Next ➡️",
+                    key="users_next",
+                    disabled=not has_next,
+                    use_container_width=True,
+                    on_click=cursors.append,
+                    args=(page_cursor(users[-1], sort_by) if users else None,)
+                )
+            
+            # Download button, streams every user page by page when clicked
+            export_download_button(
+                "📥 Download Users Data",
+                lambda: iter_user_batches(store, ['id', 'username', 'email', 'created_at']),
+                'users_data',
+                key="users_download"
+            )
+        else:
+            st.info("No users found in the database.")
+            
+    except Exception as e:
+        st.error(f"Error fetching user data: {str(e)}")
+
+@profiler.timed('page.update_profile')
+def show_update_profile_page():
+    st.markdown('<div class="main-header">⚙️ Update Profile</div>', unsafe_allow_html=True)
+    st.markdown('<p style="color: #666; margin-bottom: 2rem;">Update your account information</p>', unsafe_allow_html=True)
+    
+    # Get current user info
+    user_info = get_user_info(st.session_state.username)
+    
+    if user_info:
+        current_email, created_at = user_info
+        
+        # Display current info
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">👤 Current Username</div>
+                <div style="font-size: 1.2rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                    {st.session_state.username}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">📧 Current Email</div>
+                <div style="font-size: 1.2rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                    {current_email}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Update form
+        st.markdown("### 🔄 Update Information")
+        
+        show_update_form(current_email)
+    else:
+        st.error("Could not fetch user information.")
+
+# Submitting the form reruns only the form until the profile actually changes
+@st.fragment
+def show_update_form(current_email):
+    with st.form("update_form"):
+        new_email = st.text_input("New Email", value=current_email, placeholder="Enter new email")
+        new_username = st.text_input("New Username", value=st.session_state.username, placeholder="Enter new username")
+        
+        st.markdown("---")
+        st.markdown("#### 🔒 Change Password (Optional)")
+        
+        current_password = st.text_input("Current Password", type="password", placeholder="Enter current password")
+        new_password = st.text_input("New Password", type="password", placeholder="Enter new password")
+        confirm_password = st.text_input("Confirm New Password", type="password", placeholder="Confirm new password")
+        
+        col1, col2, col3 = st.columns([1, 1, 1])
+        
+        with col2:
+            submit_button = st.form_submit_button("💾 Update Profile", use_container_width=True)
+        
+        if submit_button:
+            try:
+                username = st.session_state.username
+                hasher = get_password_hasher()
+                
+                # The username check, the current password check (reading the
+                # profile from the store if this session hasn't cached it) and
+                # hashing the new password are independent, so they run at once
+                checks = {}
+                if new_username != username:
+                    checks['username_taken'] = lambda: store.username_exists(new_username)
+                if current_password:
+                    profile = cached_user_profile(username)
+                    
+                    def current_password_ok():
+                        user = profile or store.get_user(username, PROFILE_COLUMNS)
+                        return bool(user) and hasher.verify(current_password, user['password'])
+                    
+                    checks['password_ok'] = current_password_ok
+                    if new_password and new_password == confirm_password and len(new_password) >= 6:
+                        checks['new_hash'] = lambda: hasher.hash(new_password)
+                results = dict(zip(checks, fetch_pool.run(*checks.values())))
+                
+                # Update email and username
+                update_data = {}
+                
+                if new_email != current_email:
+                    update_data['email'] = new_email
+                
+                if new_username != username:
+                    if results['username_taken']:
+                        st.error("❌ Username already exists!")
+                        st.stop()
+                    # A concurrent sign-up can still take it; the update itself checks again
+                    update_data['username'] = new_username
+                
+                # Update password if provided
+                if current_password:
+                    if not results['password_ok']:
+                        st.error("❌ Current password is incorrect!")
+                        st.stop()
+                    
+                    if new_password and confirm_password:
+                        if new_password != confirm_password:
+                            st.error("❌ New passwords do not match!")
+                            st.stop()
+                        elif len(new_password) < 6:
+                            st.error("❌ Password must be at least 6 characters!")
+                            st.stop()
+                        else:
+                            update_data['password'] = results['new_hash']
+                    elif new_password or confirm_password:
+                        st.error("❌ Please fill both new password fields!")
+                        st.stop()
+                
+                # Perform update if there are changes
+                if update_data:
+                    try:
+                        store.update_user(st.session_state.username, update_data)
+                    except UserExistsError:
+                        st.error("❌ Username already exists!")
+                        st.stop()
+                    
+                    invalidate_user_profile(st.session_state.username)
+                    views.refresh('user_stats')
+                    
+                    # Update session state if username changed
+                    if 'username' in update_data:
+                        st.session_state.username = new_username
+                    
+                    st.success("✅ Profile updated successfully!")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.info("ℹ️ No changes to update.")
+            
+            except Exception as e:
+                st.error(f"❌ Error updating profile: {str(e)}")
+
+@profiler.timed('page.dataset')
+def show_dataset_page():
+    st.markdown('<div class="main-header">📁 Dataset Explorer</div>', unsafe_allow_html=True)
+    st.markdown('<p style="color: #666; margin-bottom: 2rem;">View and analyze your data</p>', unsafe_allow_html=True)
+    
+    df, version = load_dataset()
+    index = build_filter_index(df, version)
+    cube = dataset_cube(df, version)
+    publish_dataset(df, cube, version)
+    first_date, last_date = pd.Timestamp(index.dates[0]), pd.Timestamp(index.dates[-1])
+    total_bytes, bytes_per_row = memory_footprint(df)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">📊 Total Records</div>
+            <div class="metric-value">{len(df):,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">📋 Columns</div>
+            <div class="metric-value">{len(df.columns)}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">📅 Date Range</div>
+            <div style="font-size: 0.9rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                {first_date.strftime('%Y-%m-%d')} to {last_date.strftime('%Y-%m-%d')}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">💾 Memory (shared)</div>
+            <div style="font-size: 0.9rem; font-weight: 600; color: #667eea; margin-top: 0.5rem;">
+                {total_bytes / 1024 ** 2:,.1f} MB · {bytes_per_row:.0f} B/row
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    show_dataset_explorer(index, cube, version, first_date, last_date)
+
+# Filter and table interactions rerun only the explorer below the summary cards
+@st.fragment
+def show_dataset_explorer(index, cube, version, first_date, last_date):
+    st.markdown("### 🔍 Filters")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        selected_category = st.multiselect(
+            "Category",
+            options=index.options['Category'],
+            default=index.options['Category']
+        )
+    
+    with col2:
+        selected_region = st.multiselect(
+            "Region",
+            options=index.options['Region'],
+            default=index.options['Region']
+        )
+    
+    with col3:
+        date_range = st.date_input(
+            "Date Range",
+            value=(first_date, last_date),
+            min_value=first_date,
+            max_value=last_date
+        )
+    
+    # The end date is inclusive, so the range runs up to the following midnight
+    start, end = None, None
+    if len(date_range) == 2:
+        start = pd.Timestamp(date_range[0])
+        end = pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+    
+    filtered_df = index.filter(
+        {'Category': selected_category, 'Region': selected_region},
+        start,
+        end
+    )
+    
+    # Selection totals come from the rollup cube, not from scanning filtered_df
+    selection = cube.query(
+        'day',
+        start,
+        end,
+        filters={'Category': selected_category, 'Region': selected_region}
+    )
+    selection_means = means(selection)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Matching Records", f"{int(selection['Rows']):,}")
+    col2.metric("Sales", f"${selection['Sales']:,.0f}")
+    col3.metric("Profit", f"${selection['Profit']:,.0f}")
+    col4.metric("Avg Satisfaction", f"{selection_means['Satisfaction']:.2f}" if selection['Rows'] else "N/A")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("### 📊 Data Table")
+    
+    # The unfiltered table reuses the precomputed gradient scales
+    scales = None
+    if len(filtered_df) == len(index.df):
+        snapshot = views.latest('table_scales')
+        if snapshot is not None and snapshot.version == version:
+            scales = snapshot.value
+    
+    with profiler.span('dataset.table'):
+        render_table(
+            filtered_df,
+            DATASET_GRADIENT_COLUMNS,
+            key="dataset_table",
+            page_size=DATASET_PAGE_ROWS,
+            max_styled_rows=DATASET_MAX_STYLED_ROWS,
+            scales=scales
+        )
+    
+    export_download_button(
+        "📥 Download Filtered Data",
+        lambda: iter_frame_batches(filtered_df),
+        'filtered_data',
+        key="dataset_download"
+    )
+
+def show_performance_panel():
+    """Admin-only sidebar summary of recorded timings, with a JSON lines export"""
+    with st.sidebar:
+        st.markdown('<div class="section-header">Performance</div>', unsafe_allow_html=True)
+        with st.expander("⏱️ Timings", expanded=False):
+            summary = profiler.summary()
+            if not summary:
+                st.caption("Nothing recorded yet.")
+            else:
+                st.dataframe(
+                    pd.DataFrame(summary)[['name', 'calls', 'mean_ms', 'max_ms', 'total_ms', 'bytes', 'errors']],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'mean_ms': st.column_config.NumberColumn("mean ms", format="%.1f"),
+                        'max_ms': st.column_config.NumberColumn("max ms", format="%.1f"),
+                        'total_ms': st.column_config.NumberColumn("total ms", format="%.0f"),
+                    }
+                )
+            st.download_button(
+                "📥 Export JSON lines",
+                profiler.to_jsonl,
+                file_name="timings.jsonl",
+                mime="application/jsonl",
+                key="timings_download",
+                use_container_width=True
+            )
+            if st.button("Reset timings", key="timings_reset", use_container_width=True):
+                profiler.reset()
+                st.rerun()
@@ -0,0 +1,245 @@
+import io
+import os
+import re
+import sqlite3
+import time
+import urllib.request
+from urllib.parse import urlparse
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet sources are optional
+    pq = None
+
+try:
+    import sqlalchemy
+except ImportError:  # Only needed for non-SQLite databases
+    sqlalchemy = None
+
+# The dataset schema every page expects, in display order
+DATE_COLUMN = 'Date'
+MEASURE_COLUMNS = ['Sales', 'Profit', 'Customers', 'Satisfaction']
+CATEGORY_COLUMNS = ['Category', 'Region']
+SCHEMA_COLUMNS = ['Date', 'Sales', 'Profit', 'Customers', 'Category', 'Region', 'Satisfaction']
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+_CSV_DTYPES = {
+    **{column: 'float32' for column in MEASURE_COLUMNS},
+    **{column: 'category' for column in CATEGORY_COLUMNS},
+}
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def normalize_chunk(chunk):
+    """Select the schema columns of a raw chunk and give them their storage dtypes"""
+    missing = [column for column in SCHEMA_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Dataset is missing columns: {', '.join(missing)}")
+    columns = {}
+    for column in SCHEMA_COLUMNS:
+        values = chunk[column]
+        if column == DATE_COLUMN:
+            values = pd.to_datetime(values)
+        elif column in MEASURE_COLUMNS:
+            values = values.astype('float32')
+        else:
+            values = values.astype('category')
+        columns[column] = values.reset_index(drop=True)
+    return pd.DataFrame(columns)
+
+
+def concat_chunks(chunks):
+    """Normalize and concatenate chunks, merging their category sets"""
+    parts = [normalize_chunk(chunk) for chunk in chunks]
+    if not parts:
+        return normalize_chunk(pd.DataFrame({column: [] for column in SCHEMA_COLUMNS}))
+    if len(parts) == 1:
+        return parts[0]
+    # Plain concat would fall back to object dtype when chunks saw different
+    # category values, so categoricals are merged separately
+    df = pd.concat([part.drop(columns=CATEGORY_COLUMNS) for part in parts], ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        df[column] = union_categoricals([part[column] for part in parts])
+    return df[SCHEMA_COLUMNS]
+
+
+def memory_footprint(df):
+    """Total in-memory size of df in bytes and the average per row"""
+    total = int(df.memory_usage(deep=True).sum())
+    return total, (total / len(df) if len(df) else 0.0)
+
+
+def _is_url(path):
+    return urlparse(path).scheme in ('http', 'https')
+
+
+class DataSource:
+    """A place the dashboard dataset can be loaded from.
+
+    identity() returns a string that changes whenever the underlying data
+    does (file mtime, HTTP ETag, ...). It is what the loaded frame is cached
+    under, so the data is only read again after it actually changed.
+    """
+
+    # Seconds an identity is reused before it is checked again. Local files
+    # are stat()ed on every call, remote checks are rate limited.
+    identity_ttl = 0
+
+    def __init__(self):
+        self._identity = None
+        self._identity_checked = 0.0
+
+    def identity(self):
+        """Cheap fingerprint of the current contents of the source"""
+        now = time.monotonic()
+        if self._identity is None or now - self._identity_checked >= self.identity_ttl:
+            self._identity = self._fetch_identity()
+            self._identity_checked = now
+        return self._identity
+
+    def _fetch_identity(self):
+        raise NotImplementedError
+
+    def iter_chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield the raw data as DataFrames of at most chunk_rows rows"""
+        raise NotImplementedError
+
+    def iter_chunks_since(self, after, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield only the rows dated on or after the high-water mark `after`.
+
+        The mark's own date is included because rows sharing it may still be
+        arriving. The generic version still reads the whole source and drops
+        older rows; sources that can push the predicate down override it.
+        """
+        for chunk in self.iter_chunks(chunk_rows):
+            chunk = chunk[pd.to_datetime(chunk[DATE_COLUMN]) >= after]
+            if len(chunk):
+                yield chunk
+
+    def load(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Read the whole source into a normalized DataFrame"""
+        return concat_chunks(self.iter_chunks(chunk_rows))
+
+
+class FileSource(DataSource):
+    """A local file or an http(s) URL"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        if _is_url(path):
+            self.identity_ttl = 30
+
+    def _fetch_identity(self):
+        if _is_url(self.path):
+            request = urllib.request.Request(self.path, method='HEAD')
+            with urllib.request.urlopen(request, timeout=10) as response:
+                tag = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            return f'{self.path}:{tag}'
+        stat = os.stat(self.path)
+        return f'{self.path}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+class CSVSource(FileSource):
+    """CSV file read in chunks with the schema dtypes applied while parsing"""
+
+    def iter_chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        yield from pd.read_csv(
+            self.path,
+            usecols=SCHEMA_COLUMNS,
+            dtype=_CSV_DTYPES,
+            parse_dates=[DATE_COLUMN],
+            chunksize=chunk_rows,
+        )
+
+
+class ParquetSource(FileSource):
+    """Parquet file read batch by batch, only the schema columns"""
+
+    def iter_chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if pq is None:
+            raise RuntimeError("Parquet sources require pyarrow")
+        source = self.path
+        if _is_url(source):
+            with urllib.request.urlopen(source, timeout=60) as response:
+                source = io.BytesIO(response.read())
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=SCHEMA_COLUMNS):
+            yield batch.to_pandas()
+
+
+class SQLSource(DataSource):
+    """A table in SQLite (`sqlite:///path.db`) or any SQLAlchemy database URL"""
+
+    def __init__(self, url, table):
+        super().__init__()
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid table name: {table}")
+        self.url = url
+        self.table = table
+        self.sqlite_path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else None
+        if self.sqlite_path is None:
+            if sqlalchemy is None:
+                raise RuntimeError("Database sources other than SQLite require sqlalchemy")
+            self.engine = sqlalchemy.create_engine(url, pool_pre_ping=True)
+            # A remote fingerprint costs a query, so don't run it every rerun
+            self.identity_ttl = 30
+
+    def _connect(self):
+        if self.sqlite_path is not None:
+            return sqlite3.connect(self.sqlite_path)
+        return self.engine.connect()
+
+    def _fetch_identity(self):
+        if self.sqlite_path is not None:
+            # WAL-mode writes land in the -wal file before the main database
+            stamps = []
+            for path in (self.sqlite_path, self.sqlite_path + '-wal'):
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    stamps.append(f'{stat.st_mtime_ns}:{stat.st_size}')
+            return f'{self.url}:{self.table}:{"/".join(stamps)}'
+        sql = f'SELECT COUNT(*), MAX("{DATE_COLUMN}") FROM {self.table}'
+        with self._connect() as conn:
+            count, latest = conn.execute(sqlalchemy.text(sql)).one()
+        return f'{self.url}:{self.table}:{count}:{latest}'
+
+    def _read_chunks(self, where='', params=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        columns = ', '.join(f'"{column}"' for column in SCHEMA_COLUMNS)
+        sql = f'SELECT {columns} FROM {self.table}{where}'
+        conn = self._connect()
+        try:
+            if self.sqlite_path is None:
+                sql = sqlalchemy.text(sql)
+            yield from pd.read_sql_query(sql, conn, params=params, parse_dates=[DATE_COLUMN], chunksize=chunk_rows)
+        finally:
+            conn.close()
+
+    def iter_chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        yield from self._read_chunks(chunk_rows=chunk_rows)
+
+    def iter_chunks_since(self, after, chunk_rows=DEFAULT_CHUNK_ROWS):
+        after = pd.Timestamp(after)
+        if self.sqlite_path is not None:
+            # pandas' to_sql stores SQLite timestamps as ISO text, which sorts correctly
+            where, params = f' WHERE "{DATE_COLUMN}" >= ?', (after.isoformat(sep=' '),)
+        else:
+            where, params = f' WHERE "{DATE_COLUMN}" >= :after', {'after': after.to_pydatetime()}
+        yield from self._read_chunks(where, params, chunk_rows)
+
+
+def open_data_source(spec, table='sales'):
+    """Create a DataSource from a path, URL or database URL"""
+    if '://' in spec and not _is_url(spec):
+        return SQLSource(spec, table)
+    path = urlparse(spec).path if _is_url(spec) else spec
+    extension = os.path.splitext(path.lower().removesuffix('.gz'))[1]
+    if extension == '.csv':
+        return CSVSource(spec)
+    if extension in ('.parquet', '.pq'):
+        return ParquetSource(spec)
+    raise ValueError(f"Unsupported data source: {spec}")
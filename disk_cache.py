@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+from shared_cache import file_lock
+
+try:
+    import pyarrow as pa
+except ImportError:  # Without pyarrow the cache is a pass-through
+    pa = None
+
+# Bump whenever normalization changes what a cached frame looks like, so files
+# written by older code are never read back
+SCHEMA_VERSION = 1
+
+
+class DatasetDiskCache:
+    """Datasets persisted as Arrow IPC files and memory-mapped when read back.
+
+    Files are keyed by the source identity and SCHEMA_VERSION. A restarted
+    process or a new replica sharing the directory maps the file instead of
+    regenerating or reloading the data, and numeric columns are served
+    straight from the page cache rather than copied into each process. On a
+    miss only one process builds the file; the others wait for it.
+    """
+
+    def __init__(self, directory, max_files=8):
+        self.directory = directory
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, identity):
+        """File the dataset with this identity is stored in"""
+        key = hashlib.blake2b(f'{SCHEMA_VERSION}:{identity}'.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f'{key}.arrow')
+
+    def read(self, identity):
+        """Memory-map a cached dataset, or return None if it isn't cached"""
+        path = self.path_for(identity)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        except (OSError, pa.ArrowInvalid):
+            # Truncated or foreign file, treat as a miss and let it be rewritten
+            return None
+        os.utime(path)
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, identity, df):
+        """Store df under identity, atomically replacing any previous file"""
+        path = self.path_for(identity)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self.prune()
+
+    def load_or_build(self, identity, build):
+        """Return the cached dataset for identity, building and storing it on a miss"""
+        if pa is None:
+            return build()
+        df = self.read(identity)
+        if df is not None:
+            return df
+        with file_lock(f'{self.path_for(identity)}.lock'):
+            df = self.read(identity)
+            if df is None:
+                self.write(identity, build())
+                # Serve the mapped copy so this process doesn't keep both in memory
+                df = self.read(identity)
+        return df
+
+    def prune(self):
+        """Delete the least recently used files beyond max_files"""
+        files = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith('.arrow')
+        ]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for path in files[self.max_files:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
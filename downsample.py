@@ -0,0 +1,87 @@
+import numpy as np
+
+# A line chart can't show more than about two distinct points per pixel
+POINTS_PER_PIXEL = 2
+
+
+def target_points(width_px, points_per_pixel=POINTS_PER_PIXEL):
+    """Number of points worth sending for a chart width_px pixels wide"""
+    return max(3, int(width_px * points_per_pixel))
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype('datetime64[ns]').astype(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the mean of the next bucket, which preserves peaks and the overall shape.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # n_out - 2 buckets over the interior points, plus the last point as the
+    # "next bucket" of the final one
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets.
+
+    Fully vectorized, so it is the cheaper choice for very long series, at the
+    cost of a slightly noisier line than LTTB.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = _as_float(y)
+    n_buckets = n_out // 2
+    bucket_size = -(-n // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    # Buckets past the end of the data are all-NaN, drop them
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * bucket_size
+    buckets = buckets[valid]
+    lows = offsets + np.nanargmin(buckets, axis=1)
+    highs = offsets + np.nanargmax(buckets, axis=1)
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def downsample(df, x, y, n_out, method='lttb'):
+    """Reduce df to about n_out rows, chosen from the (x, y) series"""
+    if len(df) <= n_out:
+        return df
+    if method == 'lttb':
+        indices = lttb_indices(df[x].to_numpy(), df[y].to_numpy(), n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(df[y].to_numpy(), n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return df.iloc[indices]
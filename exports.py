@@ -0,0 +1,161 @@
+import io
+import zlib
+
+import pandas as pd
+
+from user_store import page_cursor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+# Rows per batch when slicing an in-memory frame or paging users from the store
+EXPORT_BATCH_ROWS = 50_000
+USER_EXPORT_BATCH_ROWS = 5_000
+
+# Download formats: label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ('csv', 'text/csv'),
+    "CSV (gzip)": ('csv.gz', 'application/gzip'),
+}
+if pq is not None:
+    EXPORT_FORMATS["Parquet"] = ('parquet', 'application/vnd.apache.parquet')
+
+
+def iter_frame_batches(df, batch_size=EXPORT_BATCH_ROWS):
+    """Yield fixed-size row slices of an in-memory DataFrame"""
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def iter_user_batches(store, columns, batch_size=USER_EXPORT_BATCH_ROWS):
+    """Yield the whole user table as DataFrames, paged from the store by username"""
+    cursor = None
+    while True:
+        rows = store.list_users_page(columns, sort_by='username', descending=False, after=cursor, limit=batch_size)
+        yield pd.DataFrame(rows, columns=columns)
+        if len(rows) < batch_size:
+            return
+        cursor = page_cursor(rows[-1], 'username')
+
+
+def iter_csv(batches):
+    """Encode DataFrame batches as CSV bytes, writing the header only once"""
+    header = True
+    for batch in batches:
+        yield batch.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+
+def iter_gzip(chunks, level=6):
+    """Compress a stream of byte chunks into a single gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+class _ParquetSink(io.RawIOBase):
+    """Write-only file that hands everything written so far back via drain().
+
+    ParquetWriter records absolute row-group offsets using tell(), so the
+    position keeps counting even though written bytes are released.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return b''.join(chunks)
+
+
+def iter_parquet(batches):
+    """Encode DataFrame batches as a Parquet file, one row group per batch"""
+    if pq is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    sink = _ParquetSink()
+    writer = None
+    for batch in batches:
+        if writer is None:
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+            writer = pq.ParquetWriter(sink, table.schema)
+        else:
+            table = pa.Table.from_pandas(batch, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+    yield sink.drain()
+
+
+class ChunkStream(io.RawIOBase):
+    """Read-only file object that pulls bytes lazily from an iterator of chunks.
+
+    Only one chunk is held at a time. Rewinding to the start is allowed until
+    the first read, which is all st.download_button asks of file objects.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset == 0 and whence == io.SEEK_SET and self._position == 0:
+            return 0
+        raise io.UnsupportedOperation("ChunkStream can only be rewound before the first read")
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self._position += n
+        return n
+
+
+def export_stream(batches, fmt):
+    """Return a file object that streams batches in one of EXPORT_FORMATS"""
+    if fmt == "CSV":
+        chunks = iter_csv(batches)
+    elif fmt == "CSV (gzip)":
+        chunks = iter_gzip(iter_csv(batches))
+    elif fmt == "Parquet":
+        chunks = iter_parquet(batches)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return ChunkStream(chunks)
@@ -0,0 +1,51 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+class FetchTimeout(Exception):
+    """Raised when a backend call doesn't finish within its timeout"""
+
+
+class FetchPool:
+    """Bounded thread pool for running a page's independent backend calls at once.
+
+    A page that needs a count, a listing and a lookup submits them together
+    and waits roughly as long as the slowest one instead of their sum. The
+    pool is shared by every session, so its size also caps how many backend
+    calls the app has in flight. Calls must not touch Streamlit APIs; they
+    run outside the script thread.
+    """
+
+    def __init__(self, max_workers=8, timeout=10.0):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='page-fetch')
+
+    def run(self, *calls, timeout=None):
+        """Run zero-argument callables concurrently and return their results in order.
+
+        Each call may also be given as (callable, timeout) to override the
+        default timeout for that call. The first failure is re-raised once
+        every call has finished or timed out.
+        """
+        started = time.monotonic()
+        submitted = []
+        for call in calls:
+            call, call_timeout = call if isinstance(call, tuple) else (call, timeout or self.timeout)
+            submitted.append((call, call_timeout, self._executor.submit(call)))
+
+        results, error = [], None
+        for call, call_timeout, future in submitted:
+            remaining = max(0.0, call_timeout - (time.monotonic() - started))
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeout:
+                future.cancel()
+                name = getattr(call, '__name__', 'backend call')
+                error = error or FetchTimeout(f"{name} timed out after {call_timeout:g}s")
+                results.append(None)
+            except Exception as e:
+                error = error or e
+                results.append(None)
+        if error is not None:
+            raise error
+        return results
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Dataset Explorer filters answered from precomputed indexes.
+
+    The frame is sorted by date once, so a date range is a contiguous slice
+    found with searchsorted. Every value of each filter column gets a packed
+    row bitmap; a multiselect becomes an OR of bitmaps over just the sliced
+    bytes, and the columns are ANDed together. Results are kept in an LRU
+    keyed by the filter tuple and shared by every session using the index.
+    Entries are the packed mask over the date slice (1 bit per row, expanded
+    to positions on a hit), and the LRU is bounded to cache_bytes in total.
+    """
+
+    def __init__(self, df, columns=('Category', 'Region'), date_column='Date', cache_bytes=32 * 1024 ** 2):
+        self.df = df.sort_values(date_column, kind='stable').reset_index(drop=True)
+        self.date_column = date_column
+        self.dates = self.df[date_column].to_numpy()
+        self.options = {}
+        self.bitmaps = {}
+        for column in columns:
+            codes, uniques = pd.factorize(self.df[column], sort=True)
+            self.options[column] = list(uniques)
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(uniques)
+            }
+        self._cache = OrderedDict()
+        self._cache_bytes = cache_bytes
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def date_bounds(self, start=None, end=None):
+        """Row range [lo, hi) with start <= date < end"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start), 'left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end), 'left'))
+        return lo, max(lo, hi)
+
+    def _packed_mask(self, column, values, first, last):
+        """Packed bitmap bytes [first, last) for column in values, or None if unconstrained"""
+        values = set(values)
+        if values.issuperset(self.options[column]):
+            return None
+        packed = np.zeros(last - first, dtype=np.uint8)
+        for value in values:
+            bitmap = self.bitmaps[column].get(value)
+            if bitmap is not None:
+                packed |= bitmap[first:last]
+        return packed
+
+    def _selection(self, key):
+        """(lo, hi, packed) for a filter key; packed is None when every row in [lo, hi) matches"""
+        filters, start, end = key
+        lo, hi = self.date_bounds(start, end)
+        first, last = lo // 8, -(-hi // 8)
+        packed = None
+        for column, values in filters:
+            column_packed = self._packed_mask(column, values, first, last)
+            if column_packed is not None:
+                packed = column_packed if packed is None else packed & column_packed
+        return lo, hi, packed
+
+    def _cache_put(self, key, selection):
+        size = selection[2].nbytes if selection[2] is not None else 0
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None and previous[2] is not None:
+                self._cached_bytes -= previous[2].nbytes
+            self._cache[key] = selection
+            self._cached_bytes += size
+            while self._cached_bytes > self._cache_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                if evicted[2] is not None:
+                    self._cached_bytes -= evicted[2].nbytes
+
+    def filter(self, selections, start=None, end=None):
+        """Rows matching every {column: selected values} with start <= date < end"""
+        filters = tuple(sorted((column, frozenset(values)) for column, values in selections.items()))
+        key = (filters, start, end)
+        with self._lock:
+            selection = self._cache.get(key)
+            if selection is not None:
+                self._cache.move_to_end(key)
+        if selection is None:
+            selection = self._selection(key)
+            self._cache_put(key, selection)
+        lo, hi, packed = selection
+        if packed is None:
+            return self.df.iloc[lo:hi]
+        offset = lo - (lo // 8) * 8
+        mask = np.unpackbits(packed, count=offset + hi - lo)[offset:].view(bool)
+        return self.df.take(lo + np.flatnonzero(mask))
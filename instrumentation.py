@@ -0,0 +1,147 @@
+import functools
+import json
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+def payload_size(value):
+    """Approximate size in bytes of a result, without serializing it"""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(index=True).sum())
+        except TypeError:
+            pass
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class _Span:
+    """Handle yielded by Profiler.span for attaching the payload once it exists"""
+
+    __slots__ = ('size',)
+
+    def __init__(self):
+        self.size = None
+
+    def record(self, value):
+        """Measure value as this span's payload and hand it back"""
+        self.size = payload_size(value)
+        return value
+
+
+class Profiler:
+    """Wall time, call counts and payload sizes per instrumented operation.
+
+    Operations are timed with the span() context manager or the timed()
+    decorator. Totals are kept per name and the most recent max_events
+    calls are kept individually for export as JSON lines. When disabled,
+    span() hands back a shared no-op context and timed() functions call
+    straight through, so instrumentation can stay in the hot path.
+    """
+
+    def __init__(self, enabled=False, max_events=5000):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._events = deque(maxlen=max_events)
+        self._disabled = nullcontext(_Span())
+
+    def span(self, name):
+        """Context manager timing the enclosed block under name"""
+        if not self.enabled:
+            return self._disabled
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name):
+        span = _Span()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(name, time.perf_counter() - started, span.size, error)
+
+    def timed(self, name=None, measure_result=False):
+        """Decorator timing every call of a function, optionally sizing what it returns"""
+        def decorate(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._span(label) as span:
+                    result = func(*args, **kwargs)
+                    if measure_result:
+                        span.record(result)
+                    return result
+            return wrapper
+        return decorate
+
+    def instrument(self, obj, prefix, methods):
+        """Time the named methods of obj in place, sizing their results"""
+        for method in methods:
+            setattr(obj, method, self.timed(f'{prefix}.{method}', measure_result=True)(getattr(obj, method)))
+        return obj
+
+    def _record(self, name, seconds, size, error):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {'calls': 0, 'errors': 0, 'total_s': 0.0, 'max_s': 0.0, 'bytes': 0}
+            stats['calls'] += 1
+            stats['total_s'] += seconds
+            stats['max_s'] = max(stats['max_s'], seconds)
+            stats['bytes'] += size or 0
+            if error:
+                stats['errors'] += 1
+            self._events.append({
+                'ts': time.time(), 'name': name, 'seconds': seconds,
+                'bytes': size, 'thread': threading.current_thread().name, 'error': error,
+            })
+
+    def summary(self):
+        """One row per operation name, slowest total first"""
+        with self._lock:
+            rows = [{'name': name, **stats} for name, stats in self._stats.items()]
+        for row in rows:
+            row['mean_ms'] = row['total_s'] * 1000 / row['calls']
+            row['max_ms'] = row.pop('max_s') * 1000
+            row['total_ms'] = row.pop('total_s') * 1000
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def events_since(self, ts):
+        """Recorded calls that finished at or after ts"""
+        with self._lock:
+            return [event for event in self._events if event['ts'] >= ts]
+
+    def to_jsonl(self):
+        """Recent calls as JSON lines, oldest first"""
+        with self._lock:
+            events = list(self._events)
+        return ''.join(json.dumps(event) + '\n' for event in events)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._events.clear()
@@ -0,0 +1,146 @@
+import hashlib
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from downsample import downsample
+from rollup import means
+from shared_cache import shared_cached
+
+
+def dataset_version(df):
+    """Content hash of a DataFrame, used as the cache key for everything derived from it"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(','.join(df.columns).encode())
+    return digest.hexdigest()
+
+
+# The cached functions below take the frame or rollup cube as `_df`/`_cube` so
+# Streamlit doesn't hash it on every call; `version` (from dataset_version or
+# the source identity) is the real cache key. Aggregates are read from the
+# RollupCube rather than the raw rows. shared_cached adds a tier below the
+# per-process cache that replicas share, so a result is computed once per
+# deployment rather than once per process.
+
+@st.cache_data(max_entries=8)
+@shared_cached('kpis')
+def compute_kpis(_cube, version):
+    """KPI aggregates for the dashboard metric cards"""
+    totals = _cube.query()
+    averages = means(totals)
+    return {
+        'total_sales': float(totals['Sales']),
+        'total_profit': float(totals['Profit']),
+        'avg_customers': float(averages['Customers']),
+        'avg_satisfaction': float(averages['Satisfaction']),
+    }
+
+
+# Built by the view scheduler off the script thread, where st.cache_data isn't
+# available; its snapshot is the per-process copy
+@shared_cached('category_sales')
+def category_sales(_cube, version):
+    """Total sales per category"""
+    return _cube.query(by=['Category'])[['Sales']].reset_index()
+
+
+@st.cache_data(max_entries=8)
+@shared_cached('sales_trend_figure')
+def sales_trend_figure_json(_df, version, max_points, webgl_threshold):
+    """Serialized Sales Trend line chart.
+
+    The series is downsampled to max_points with LTTB before it is handed to
+    Plotly, and drawn with WebGL if it still has more than webgl_threshold
+    points (e.g. when max_points is raised for a very wide chart).
+    """
+    trend = downsample(_df[['Date', 'Sales']].sort_values('Date'), 'Date', 'Sales', max_points)
+    scatter = go.Scattergl if len(trend) > webgl_threshold else go.Scatter
+    fig_sales = go.Figure()
+    fig_sales.add_trace(scatter(
+        x=trend['Date'],
+        y=trend['Sales'],
+        mode='lines',
+        name='Sales',
+        line=dict(color='#667eea', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.1)'
+    ))
+    fig_sales.update_layout(
+        title='📈 Sales Trend Over Time',
+        xaxis_title='Date',
+        yaxis_title='Sales ($)',
+        hovermode='x unified',
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Inter', size=12),
+        height=400
+    )
+    return fig_sales.to_json()
+
+
+@shared_cached('category_pie_figure')
+def category_pie_figure_json(_cube, version):
+    """Serialized Sales by Category pie chart"""
+    fig_pie = px.pie(
+        category_sales(_cube, version),
+        values='Sales',
+        names='Category',
+        title='🎯 Sales by Category',
+        color_discrete_sequence=px.colors.sequential.RdBu,
+        hole=0.4
+    )
+    fig_pie.update_layout(
+        font=dict(family='Inter', size=12),
+        height=400
+    )
+    return fig_pie.to_json()
+
+
+def figure_from_json(fig_json):
+    """Rebuild a Plotly figure from its cached JSON"""
+    return pio.from_json(fig_json, skip_invalid=True)
+
+
+@st.cache_data(max_entries=32)
+@shared_cached('period_deltas')
+def period_deltas(_cube, version, period_days):
+    """Change of each KPI over the last period_days against the period before it.
+
+    Daily totals come from the day cells of the rollup cube; a rolling window
+    over the gap-filled daily series then gives both periods at once. Sales,
+    profit and customers are compared as percentages (customers and
+    satisfaction per record, like the cards), satisfaction as an absolute
+    difference. Values are None when the data doesn't cover two full periods.
+    """
+    daily = _cube.query('day', by=['Period'])
+    if not daily.empty:
+        daily = daily.asfreq('D', fill_value=0)
+    windows = daily.rolling(period_days).sum()
+    if len(windows) < 2 * period_days:
+        return dict.fromkeys(('sales_pct', 'profit_pct', 'customers_pct', 'satisfaction_diff'))
+    current = windows.iloc[-1]
+    previous = windows.iloc[-1 - period_days]
+
+    def mean(window, column):
+        return window[column] / window['Rows'] if window['Rows'] else None
+
+    def pct_change(new, old):
+        if new is None or not old:
+            return None
+        return float((new - old) / old * 100)
+
+    current_satisfaction = mean(current, 'Satisfaction')
+    previous_satisfaction = mean(previous, 'Satisfaction')
+    return {
+        'sales_pct': pct_change(current['Sales'], previous['Sales']),
+        'profit_pct': pct_change(current['Profit'], previous['Profit']),
+        'customers_pct': pct_change(mean(current, 'Customers'), mean(previous, 'Customers')),
+        'satisfaction_diff': (
+            float(current_satisfaction - previous_satisfaction)
+            if current_satisfaction is not None and previous_satisfaction is not None else None
+        ),
+    }
@@ -0,0 +1,120 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Hashes written by the original SHA-256 scheme are 64 lowercase hex digits
+_LEGACY_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# Range of scrypt CPU/memory cost (log2 of N) calibration may pick from
+MIN_LOG2_N = 12
+MAX_LOG2_N = 17
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * r * n,
+        dklen=KEY_BYTES,
+    )
+
+
+def is_legacy_hash(stored):
+    """Return True for an unsalted SHA-256 hash from the original scheme"""
+    return bool(_LEGACY_SHA256.match(stored))
+
+
+class PasswordHasher:
+    """Salted scrypt password hashing.
+
+    Stored hashes look like `scrypt$<n>$<r>$<p>$<salt>$<key>` so the cost can
+    be raised later without breaking existing accounts. The KDF runs in a
+    small bounded thread pool: a burst of logins queues up behind it instead
+    of every script thread burning CPU and scrypt memory at once.
+    """
+
+    def __init__(self, n=2 ** 14, r=SCRYPT_R, p=SCRYPT_P, max_workers=4, timeout=10.0):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+
+    @classmethod
+    def calibrate(cls, budget_ms, samples=5, **kwargs):
+        """Pick the highest scrypt cost whose slowest sample fits in budget_ms"""
+        salt = os.urandom(SALT_BYTES)
+        best = 2 ** MIN_LOG2_N
+        for log2_n in range(MIN_LOG2_N, MAX_LOG2_N + 1):
+            n = 2 ** log2_n
+            worst = 0.0
+            for _ in range(samples):
+                start = time.perf_counter()
+                _scrypt('calibration', salt, n, SCRYPT_R, SCRYPT_P)
+                worst = max(worst, time.perf_counter() - start)
+            if worst * 1000 > budget_ms:
+                break
+            best = n
+        return cls(n=best, **kwargs)
+
+    def _hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        key = _scrypt(password, salt, self.n, self.r, self.p)
+        return f'scrypt${self.n}${self.r}${self.p}${_b64(salt)}${_b64(key)}'
+
+    def _verify(self, password, stored):
+        if is_legacy_hash(stored):
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(candidate, stored)
+        try:
+            scheme, n, r, p, salt, key = stored.split('$')
+            if scheme != 'scrypt':
+                return False
+            expected = base64.b64decode(key)
+            candidate = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(candidate, expected)
+
+    def hash(self, password):
+        """Hash password with a fresh salt"""
+        return self._executor.submit(self._hash, password).result(timeout=self.timeout)
+
+    def verify(self, password, stored):
+        """Check password against a stored hash in constant time"""
+        return self._executor.submit(self._verify, password, stored).result(timeout=self.timeout)
+
+    def needs_rehash(self, stored):
+        """Return True if stored was made by the legacy scheme or is weaker than this hasher.
+
+        Each replica calibrates n for itself, so a hash with a higher n than
+        ours is left alone rather than downgraded or rewritten back and forth.
+        """
+        if is_legacy_hash(stored):
+            return True
+        try:
+            scheme, n, r, p, _, _ = stored.split('$')
+            n, r, p = int(n), int(r), int(p)
+        except ValueError:
+            return True
+        return scheme != 'scrypt' or n < self.n or (r, p) != (self.r, self.p)
+
+    def rehash_in_background(self, password, save):
+        """Hash password off the request path and pass the result to save"""
+        return self._executor.submit(lambda: save(self._hash(password)))
@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+
+class MemoryBucketStore:
+    """Token buckets held in this process, least recently used keys evicted first.
+
+    An evicted key simply starts again with a full bucket, so max_keys bounds
+    memory without ever blocking a legitimate user.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now):
+        """Spend one token from key's bucket; return (allowed, seconds until a token is available)"""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, allowed, retry_after = _spend(tokens, updated, capacity, refill_rate, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, retry_after
+
+    def refund(self, key, capacity, refill_rate, now):
+        """Give back one token spent from key's bucket"""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (_refill(tokens + 1, updated, capacity, refill_rate, now), now)
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file, shared by every replica that can reach it"""
+
+    def __init__(self, path, idle_seconds=3600):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+        self._last_prune = time.time()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, refill_rate, now):
+        """Spend one token from key's bucket; return (allowed, seconds until a token is available)"""
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front so replicas can't both spend the last token
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, allowed, retry_after = _spend(tokens, updated, capacity, refill_rate, now)
+            conn.execute(
+                'INSERT INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now)
+            )
+            if now - self._last_prune > self.idle_seconds:
+                conn.execute('DELETE FROM rate_buckets WHERE updated < ?', (now - self.idle_seconds,))
+                self._last_prune = now
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, retry_after
+
+    def refund(self, key, capacity, refill_rate, now):
+        """Give back one token spent from key's bucket"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+            if row:
+                tokens = _refill(row[0] + 1, row[1], capacity, refill_rate, now)
+                conn.execute('UPDATE rate_buckets SET tokens = ?, updated = ? WHERE key = ?', (tokens, now, key))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def _refill(tokens, updated, capacity, refill_rate, now):
+    """Tokens in a bucket after refilling for the time elapsed since updated"""
+    return min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+
+
+def _spend(tokens, updated, capacity, refill_rate, now):
+    """Refill for the time elapsed since updated, then try to spend one token"""
+    tokens = _refill(tokens, updated, capacity, refill_rate, now)
+    if tokens >= 1:
+        return tokens - 1, True, 0.0
+    return tokens, False, (1 - tokens) / refill_rate
+
+
+class LoginRateLimiter:
+    """Token-bucket limits on sign-in attempts per username and per client IP.
+
+    Every attempt spends a token from both buckets before the user store or
+    the password hasher is touched. The username bucket is small and refills
+    slowly, which amounts to a lockout after repeated guesses at one account;
+    the IP bucket is larger and stops one client spraying many accounts. A
+    successful sign-in gets its username token back through succeeded(), so
+    only failed attempts count towards an account's lockout.
+    """
+
+    def __init__(self, store=None, username_capacity=5, username_refill_seconds=60,
+                 ip_capacity=30, ip_refill_seconds=2):
+        self.store = store or MemoryBucketStore()
+        self.limits = {
+            'ip': (ip_capacity, 1.0 / ip_refill_seconds),
+            'username': (username_capacity, 1.0 / username_refill_seconds),
+        }
+        self._counts = Counter()
+        self._counts_lock = threading.Lock()
+
+    def check(self, username, ip):
+        """Return (allowed, retry_after_seconds) for one sign-in attempt"""
+        now = time.time()
+        keys = {'ip': ip, 'username': username.strip().lower()}
+        for scope in ('ip', 'username'):
+            if keys[scope] is None:
+                continue
+            capacity, refill_rate = self.limits[scope]
+            allowed, retry_after = self.store.take(f'{scope}:{keys[scope]}', capacity, refill_rate, now)
+            if not allowed:
+                self._count(f'rejected_{scope}')
+                return False, retry_after
+        self._count('allowed')
+        return True, 0.0
+
+    def succeeded(self, username):
+        """Refund the username token of an attempt that signed in"""
+        capacity, refill_rate = self.limits['username']
+        self.store.refund(f'username:{username.strip().lower()}', capacity, refill_rate, time.time())
+
+    def _count(self, name):
+        with self._counts_lock:
+            self._counts[name] += 1
+
+    def counters(self):
+        """Attempts allowed and rejected (by IP or by username) since startup"""
+        with self._counts_lock:
+            return {name: self._counts[name] for name in ('allowed', 'rejected_ip', 'rejected_username')}
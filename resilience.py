@@ -0,0 +1,157 @@
+import random
+import sqlite3
+import threading
+import time
+
+from user_store import UserStore
+
+try:
+    import httpx
+except ImportError:  # Only present alongside the Supabase client
+    httpx = None
+
+
+class BackendUnavailable(Exception):
+    """Raised without calling the backend while it is considered unhealthy or saturated"""
+
+
+class TransientBackendError(Exception):
+    """A failure worth retrying, e.g. a dropped connection or a busy database"""
+
+
+def is_transient(error):
+    """Return True for errors that a retry (or waiting for the backend) may fix"""
+    if isinstance(error, (TransientBackendError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, sqlite3.OperationalError):
+        return 'locked' in str(error) or 'busy' in str(error)
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    # PostgREST errors carry the HTTP status or a Postgres SQLSTATE in `code`
+    code = str(getattr(error, 'code', '') or '')
+    return code.startswith('5') and len(code) == 3
+
+
+class CircuitBreaker:
+    """Fails fast after repeated transient failures, then probes for recovery.
+
+    After failure_threshold consecutive failures the circuit opens and every
+    call is rejected for reset_timeout seconds. Then a single trial call is
+    let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def before_call(self):
+        """Raise BackendUnavailable unless a call may go through now"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                raise BackendUnavailable("Service temporarily unavailable, please try again shortly")
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class ResilientUserStore(UserStore):
+    """Wraps a UserStore with a concurrency cap, read retries and a circuit breaker.
+
+    At most max_concurrency calls reach the backend at once; callers that
+    can't get a slot within acquire_timeout fail fast instead of piling up on
+    a slow backend. Reads are idempotent and are retried up to `retries`
+    times with capped, fully jittered exponential backoff; writes are never
+    retried. Only transient errors count towards opening the circuit.
+    """
+
+    def __init__(self, inner, breaker=None, retries=2, base_delay=0.1, max_delay=1.0,
+                 max_concurrency=16, acquire_timeout=2.0):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _call(self, method, *args, idempotent, **kwargs):
+        attempts = self.retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            if not self._slots.acquire(timeout=self.acquire_timeout):
+                raise BackendUnavailable("Service is busy, please try again shortly")
+            # Checked only once a slot is held: a half-open trial that then
+            # couldn't get a slot would never report back and keep the circuit open
+            try:
+                self.breaker.before_call()
+            except BackendUnavailable:
+                self._slots.release()
+                raise
+            try:
+                result = getattr(self.inner, method)(*args, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 == attempts:
+                    raise
+            else:
+                self.breaker.record_success()
+                return result
+            finally:
+                self._slots.release()
+            time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def get_user(self, username, columns):
+        return self._call('get_user', username, columns, idempotent=True)
+
+    def username_exists(self, username):
+        return self._call('username_exists', username, idempotent=True)
+
+    def insert_user(self, data):
+        return self._call('insert_user', data, idempotent=False)
+
+    def update_user(self, username, data, expected=None):
+        return self._call('update_user', username, data, expected=expected, idempotent=False)
+
+    def list_users(self, columns):
+        return self._call('list_users', columns, idempotent=True)
+
+    def list_users_page(self, columns, sort_by='created_at', descending=True, after=None, limit=50):
+        return self._call(
+            'list_users_page', columns,
+            sort_by=sort_by, descending=descending, after=after, limit=limit,
+            idempotent=True,
+        )
+
+    def count_users(self):
+        return self._call('count_users', idempotent=True)
+
+    def latest_user(self):
+        return self._call('latest_user', idempotent=True)
@@ -0,0 +1,118 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+MEASURES = ['Sales', 'Profit', 'Customers', 'Satisfaction']
+DIMENSIONS = ['Category', 'Region']
+GRAINS = ('day', 'week', 'month')
+
+
+def period_start(dates, grain):
+    """First day of the day/week (Monday)/month each date falls in"""
+    dates = pd.DatetimeIndex(dates).normalize()
+    if grain == 'day':
+        return dates
+    if grain == 'week':
+        return dates - pd.to_timedelta(dates.dayofweek, unit='D')
+    if grain == 'month':
+        return dates - pd.to_timedelta(dates.day - 1, unit='D')
+    raise ValueError(f"Unknown grain: {grain}")
+
+
+def _merge(cells, partial):
+    """Add partial into a copy of cells, touching only the cells partial covers.
+
+    Readers may hold the previous frame, so it is never modified in place.
+    """
+    cells = cells.copy()
+    partial = partial.astype(cells.dtypes.to_dict())
+    existing = partial.index.isin(cells.index)
+    if existing.any():
+        cells.loc[partial.index[existing]] += partial[existing].to_numpy()
+    if not existing.all():
+        cells = pd.concat([cells, partial[~existing]]).sort_index()
+    return cells
+
+
+class RollupCube:
+    """Pre-aggregated Sales/Profit/Customers/Satisfaction by Category x Region x period.
+
+    Each cell holds the float64 sum of every measure plus its row count, so
+    totals and means over any slice come from a few thousand cells instead
+    of the raw rows. Day cells are built in a single groupby pass; week and
+    month cells are rolled up from the day cells. update() folds new rows in
+    by aggregating just those rows and adding them to the cells they hit.
+    """
+
+    def __init__(self, df):
+        self._lock = threading.Lock()
+        self._cells = {'day': self._aggregate_rows(df)}
+        for grain in GRAINS[1:]:
+            self._cells[grain] = self._roll_up(self._cells['day'], grain)
+
+    @staticmethod
+    def _aggregate_rows(df):
+        keys = [pd.Series(period_start(df['Date'], 'day'), index=df.index, name='Period')]
+        keys += [df[dimension] for dimension in DIMENSIONS]
+        cells = df[MEASURES].groupby(keys, observed=True).sum().astype('float64')
+        cells['Rows'] = df.groupby(keys, observed=True).size().astype('int64')
+        return cells.sort_index()
+
+    @staticmethod
+    def _roll_up(day_cells, grain):
+        periods = period_start(day_cells.index.get_level_values('Period'), grain)
+        keys = [periods.rename('Period')] + [day_cells.index.get_level_values(d) for d in DIMENSIONS]
+        return day_cells.groupby(keys, observed=True).sum().sort_index()
+
+    def update(self, new_rows, removed_rows=None):
+        """Fold new raw rows into the cube, taking removed_rows back out first"""
+        if new_rows.empty and (removed_rows is None or removed_rows.empty):
+            return
+        day_partial = self._aggregate_rows(new_rows)
+        if removed_rows is not None and not removed_rows.empty:
+            day_partial = day_partial.sub(self._aggregate_rows(removed_rows), fill_value=0)
+        with self._lock:
+            for grain in GRAINS:
+                partial = day_partial if grain == 'day' else self._roll_up(day_partial, grain)
+                self._cells[grain] = _merge(self._cells[grain], partial)
+
+    def with_rows(self, new_rows, removed_rows=None):
+        """A new cube with new_rows folded in (and removed_rows out), leaving this one untouched"""
+        cube = object.__new__(RollupCube)
+        cube._lock = threading.Lock()
+        cube._cells = dict(self._cells)
+        cube.update(new_rows, removed_rows)
+        return cube
+
+    def cells(self, grain='day'):
+        """All cells at grain, indexed by (Period, Category, Region)"""
+        return self._cells[grain]
+
+    def query(self, grain='day', start=None, end=None, filters=None, by=()):
+        """Sums and row counts over the matching cells.
+
+        start/end bound the period start (start <= period < end), filters maps
+        a dimension to the values to keep. Returns one Series of totals, or a
+        frame grouped by the index levels named in by.
+        """
+        cells = self._cells[grain]
+        mask = np.ones(len(cells), dtype=bool)
+        periods = cells.index.get_level_values('Period')
+        if start is not None:
+            mask &= periods >= pd.Timestamp(start)
+        if end is not None:
+            mask &= periods < pd.Timestamp(end)
+        for dimension, values in (filters or {}).items():
+            mask &= cells.index.get_level_values(dimension).isin(list(values))
+        selected = cells[mask]
+        if by:
+            return selected.groupby(level=list(by), observed=True).sum()
+        return selected.sum()
+
+
+def means(totals):
+    """Per-row means of the measures from a query() result"""
+    if isinstance(totals, pd.DataFrame):
+        return totals[MEASURES].div(totals['Rows'].where(totals['Rows'] != 0), axis=0)
+    return totals[MEASURES] / totals['Rows'] if totals['Rows'] else totals[MEASURES] * np.nan
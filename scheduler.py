@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    """A precomputed view: its value, the data version it was built from and when"""
+    value: Any
+    version: Any
+    computed_at: float
+
+    @property
+    def age(self):
+        """Seconds since the value was computed"""
+        return time.time() - self.computed_at
+
+
+class ViewFailed(Exception):
+    """Raised for a view that has no snapshot because its computation is failing"""
+
+
+class _View:
+    __slots__ = ('compute', 'every', 'version', 'snapshot', 'due', 'error', 'failures', 'retry_at')
+
+    def __init__(self, compute, every, version):
+        self.compute = compute
+        self.every = every
+        self.version = version
+        self.snapshot = None
+        self.due = True
+        self.error = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class ViewScheduler:
+    """Precomputes registered views on a background thread.
+
+    A view is recomputed when `every` seconds have passed since its last
+    snapshot, when its `version` callable returns something new, or when
+    refresh() is called. Pages read the latest ready snapshot with latest()
+    and never compute on the request path; a failed recompute keeps the
+    previous snapshot, records the error and is retried with exponential
+    backoff from tick up to max_backoff seconds.
+
+    Inputs the pages already hold (e.g. the loaded dataset) are handed over
+    with publish() rather than loaded again from the background thread. A
+    version callable returning None means the view's inputs aren't there
+    yet, and the view is skipped until they are.
+    """
+
+    def __init__(self, tick=1.0, max_backoff=300.0):
+        self.tick = tick
+        self.max_backoff = max_backoff
+        self._views = {}
+        self._inputs = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name, compute, every=None, version=None):
+        """Add (or replace the computation of) a view, keeping any snapshot it already has"""
+        with self._lock:
+            view = _View(compute, every, version)
+            previous = self._views.get(name)
+            if previous is not None:
+                view.snapshot = previous.snapshot
+            self._views[name] = view
+        self._wake.set()
+
+    def latest(self, name):
+        """Most recent Snapshot of the view, or None if it hasn't been computed yet"""
+        with self._lock:
+            return self._views[name].snapshot
+
+    def wait(self, name, timeout):
+        """Latest Snapshot, waiting up to timeout seconds for the first one.
+
+        Raises ViewFailed instead of waiting when the view has no snapshot
+        and its last computation failed.
+        """
+        deadline = time.monotonic() + timeout
+        with self._ready:
+            while self._views[name].snapshot is None:
+                error = self._views[name].error
+                if error is not None:
+                    raise ViewFailed(str(error)) from error
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._ready.wait(remaining)
+            return self._views[name].snapshot
+
+    def publish(self, name, value):
+        """Make value available to view computations as published(name)"""
+        with self._lock:
+            changed = self._inputs.get(name) is not value
+            self._inputs[name] = value
+        if changed:
+            self._wake.set()
+
+    def published(self, name):
+        """The value last published under name, or None"""
+        with self._lock:
+            return self._inputs.get(name)
+
+    def refresh(self, name):
+        """Recompute the view on the next pass, e.g. after a write it depends on"""
+        with self._lock:
+            self._views[name].due = True
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='view-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            self._wake.wait(self.tick)
+            self._wake.clear()
+
+    def run_pending(self):
+        """Recompute every view that is due, one at a time"""
+        with self._lock:
+            views = list(self._views.items())
+        for name, view in views:
+            try:
+                version = view.version() if view.version else None
+                if view.version is not None and version is None:
+                    continue
+                snapshot = view.snapshot
+                stale = (
+                    view.due
+                    or snapshot is None
+                    or (view.every is not None and snapshot.age >= view.every)
+                    or (view.version is not None and version != snapshot.version)
+                )
+                if not stale or (not view.due and time.monotonic() < view.retry_at):
+                    continue
+                view.due = False
+                value = view.compute()
+            except Exception as e:
+                logger.exception("Precomputing view %r failed", name)
+                with self._ready:
+                    view.error = e
+                    view.failures += 1
+                    view.retry_at = time.monotonic() + min(self.max_backoff, self.tick * 2 ** view.failures)
+                    self._ready.notify_all()
+                continue
+            with self._ready:
+                view.snapshot = Snapshot(value, version, time.time())
+                view.error = None
+                view.failures = 0
+                self._ready.notify_all()
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from user_store import SupabaseUserStore, SQLiteUserStore, MemoryUserStore
+from resilience import ResilientUserStore, CircuitBreaker
+from ratelimit import LoginRateLimiter, MemoryBucketStore, SQLiteBucketStore
+from passwords import PasswordHasher
+from instrumentation import Profiler
+from fetch_pool import FetchPool
+from scheduler import ViewScheduler
+
+# Shared, process-wide resources. This module only depends on the standard
+# library and Streamlit so the login page can render without pandas or plotly.
+
+@st.cache_resource
+def init_profiler():
+    """Shared timing recorder for pages and backend calls, off unless PROFILING is set"""
+    return Profiler(enabled=bool(st.secrets.get("PROFILING", False)))
+
+profiler = init_profiler()
+
+# Backend limits: concurrent connections/calls and the per-request timeout
+BACKEND_MAX_CONNECTIONS = int(st.secrets.get("BACKEND_MAX_CONNECTIONS", 16))
+BACKEND_TIMEOUT_SECONDS = float(st.secrets.get("BACKEND_TIMEOUT_SECONDS", 5))
+
+# Supabase setup
+@st.cache_resource
+def init_supabase():
+    """Initialize Supabase client on a pooled keep-alive HTTP client"""
+    # Imported here so that only deployments using Supabase pay for loading it
+    import httpx
+    from supabase import create_client, ClientOptions
+    
+    url = st.secrets["SUPABASE_URL"]
+    key = st.secrets["SUPABASE_ANON_KEY"]
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=BACKEND_MAX_CONNECTIONS,
+            max_keepalive_connections=BACKEND_MAX_CONNECTIONS,
+            keepalive_expiry=60
+        ),
+        timeout=httpx.Timeout(BACKEND_TIMEOUT_SECONDS, connect=min(BACKEND_TIMEOUT_SECONDS, 3))
+    )
+    options = ClientOptions(httpx_client=http_client, postgrest_client_timeout=BACKEND_TIMEOUT_SECONDS)
+    return create_client(url, key, options=options)
+
+@st.cache_resource
+def init_user_store():
+    """Initialize the configured user store (Supabase by default, local SQLite, or in-memory)"""
+    backend = st.secrets.get("USER_STORE", "supabase")
+    if backend == "sqlite":
+        inner = SQLiteUserStore(st.secrets.get("SQLITE_PATH", "users.db"))
+    elif backend == "memory":
+        inner = MemoryUserStore(latency=float(st.secrets.get("MEMORY_STORE_LATENCY_MS", 0)) / 1000)
+    else:
+        inner = SupabaseUserStore(init_supabase())
+    # Retries for reads, fail-fast when degraded, and a cap on in-flight calls
+    # so a slow backend can't hold every script thread
+    resilient = ResilientUserStore(
+        inner,
+        CircuitBreaker(failure_threshold=5, reset_timeout=30),
+        max_concurrency=BACKEND_MAX_CONNECTIONS,
+        acquire_timeout=BACKEND_TIMEOUT_SECONDS
+    )
+    return profiler.instrument(resilient, 'store', [
+        'get_user', 'username_exists', 'insert_user', 'update_user',
+        'list_users', 'list_users_page', 'count_users', 'latest_user'
+    ])
+
+store = init_user_store()
+
+@st.cache_resource
+def init_password_hasher():
+    """Pick the strongest scrypt cost that keeps a login within the configured budget.
+
+    Calibration takes a few hashes' worth of time, so it runs on a background
+    thread and the login page renders meanwhile; get_password_hasher() waits
+    for it.
+    """
+    budget_ms = float(st.secrets.get("PASSWORD_HASH_BUDGET_MS", 250))
+    workers = int(st.secrets.get("PASSWORD_HASH_WORKERS", 4))
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hash-calibration')
+    future = executor.submit(PasswordHasher.calibrate, budget_ms, max_workers=workers)
+    executor.shutdown(wait=False)
+    return future
+
+def get_password_hasher():
+    """The calibrated PasswordHasher, waiting for calibration on first use"""
+    return init_password_hasher().result()
+
+@st.cache_resource
+def init_fetch_pool():
+    """Shared pool for running a page's independent backend calls concurrently"""
+    workers = int(st.secrets.get("FETCH_WORKERS", 8))
+    timeout = float(st.secrets.get("FETCH_TIMEOUT_SECONDS", 10))
+    return FetchPool(max_workers=workers, timeout=timeout)
+
+fetch_pool = init_fetch_pool()
+
+@st.cache_resource
+def init_login_limiter():
+    """Sign-in rate limiter, kept in memory or in SQLite shared between replicas"""
+    if st.secrets.get("RATE_LIMIT_STORE", "memory") == "sqlite":
+        buckets = SQLiteBucketStore(st.secrets.get("RATE_LIMIT_SQLITE_PATH", "rate_limits.db"))
+    else:
+        buckets = MemoryBucketStore(max_keys=int(st.secrets.get("RATE_LIMIT_MAX_KEYS", 10000)))
+    return LoginRateLimiter(
+        buckets,
+        username_capacity=int(st.secrets.get("LOGIN_ATTEMPTS_PER_USERNAME", 5)),
+        username_refill_seconds=float(st.secrets.get("LOGIN_USERNAME_REFILL_SECONDS", 60)),
+        ip_capacity=int(st.secrets.get("LOGIN_ATTEMPTS_PER_IP", 30)),
+        ip_refill_seconds=float(st.secrets.get("LOGIN_IP_REFILL_SECONDS", 2))
+    )
+
+login_limiter = init_login_limiter()
+
+# How long a page waits for a view's first snapshot after a cold start
+VIEW_WAIT_SECONDS = float(st.secrets.get("VIEW_WAIT_SECONDS", 5))
+
+@st.cache_resource
+def init_view_scheduler():
+    """Background precomputation of expensive views, started once per process"""
+    views = ViewScheduler(
+        tick=float(st.secrets.get("VIEW_SCHEDULER_TICK_SECONDS", 1)),
+        max_backoff=float(st.secrets.get("VIEW_RETRY_MAX_SECONDS", 300))
+    )
+    views.register(
+        'user_stats',
+        profiler.timed('view.user_stats')(lambda: (store.count_users(), store.latest_user())),
+        every=float(st.secrets.get("USER_STATS_REFRESH_SECONDS", 30))
+    )
+    views.start()
+    return views
+
+views = init_view_scheduler()
@@ -0,0 +1,339 @@
+import functools
+import hashlib
+import inspect
+import logging
+import marshal
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single flight is then per process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on path shared by every process on the host, held for the block"""
+    if fcntl is None:
+        with _local_lock(path):
+            yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(key):
+    with _local_locks_guard:
+        return _local_locks.setdefault(key, threading.Lock())
+
+
+_MISSING = object()
+
+
+class SharedCache:
+    """A cache of serialized values that several replicas read and fill together.
+
+    Subclasses store bytes under content-addressed keys, evict the least
+    recently used entries past max_bytes, and provide single_flight(key) so
+    that when a key is cold one process computes it while the others wait
+    and then read its result.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def put(self, key, value):
+        raise NotImplementedError
+
+    def single_flight(self, key):
+        raise NotImplementedError
+
+    def get_or_compute(self, key, compute, dumps=pickle.dumps, loads=pickle.loads):
+        """Return the cached value for key, computing and storing it at most once across replicas"""
+        # The shared tier is an optimization; never fail a page because of it.
+        # Only errors from compute() itself propagate.
+        value = self._lookup(key, loads)
+        if value is not _MISSING:
+            return value
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(self.single_flight(key))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Computing %s without single flight: %s", key, e)
+            value = self._lookup(key, loads)
+            if value is not _MISSING:
+                return value
+            value = compute()
+            try:
+                self.put(key, dumps(value))
+            except Exception as e:
+                logger.warning("Could not store %s in the shared cache: %s", key, e)
+            return value
+
+    def _lookup(self, key, loads):
+        """The cached value for key, or _MISSING when absent or unreadable here"""
+        try:
+            value = self.get(key)
+            return _MISSING if value is None else loads(value)
+        except Exception as e:
+            # Besides I/O errors, entries pickled by a replica on other pandas
+            # or plotly versions fail with AttributeError, ImportError, ...
+            logger.warning("Ignoring shared cache entry %s: %s", key, e)
+            return _MISSING
+
+
+class FilesystemCache(SharedCache):
+    """Entries as files in a directory, e.g. on a volume every replica mounts.
+
+    Reads touch a file's mtime, so eviction by oldest mtime is LRU. Single
+    flight uses flock on one of 256 lock files picked by key prefix, which
+    covers every process on a host and most shared filesystems; the lock
+    files are never evicted, so a lock can't vanish while it is held. A
+    stripe is re-entrant within a thread, so nested cached calls whose keys
+    share a prefix don't deadlock.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.join(directory, 'locks'), exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.bin')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    @contextmanager
+    def single_flight(self, key):
+        path = os.path.join(self.directory, 'locks', f'{key[:2]}.lock')
+        held = getattr(self._local, 'stripes', None)
+        if held is None:
+            held = self._local.stripes = set()
+        if path in held:
+            # A cached function computing under this stripe called another one
+            # that hashes to it; locking again from the same thread would block
+            yield
+            return
+        with file_lock(path):
+            held.add(path)
+            try:
+                yield
+            finally:
+                held.discard(path)
+
+    def evict(self):
+        """Delete the least recently used entries until the total fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.bin'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class SQLiteCache(SharedCache):
+    """Entries as rows in one SQLite file that every replica can open.
+
+    Single flight uses a lease row: the replica that inserts it computes the
+    value, the others poll until the value appears. A lease older than
+    lease_seconds is taken over, so a replica that died mid-compute can't
+    block a key forever. Reads only write the access time back once it is
+    touch_seconds old, so cache hits don't queue for the write lock.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 ** 2, lease_seconds=300, poll_seconds=0.05, touch_seconds=60):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.touch_seconds = touch_seconds
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_leases ('
+            'key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute('SELECT value, accessed FROM cache_entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, accessed = row
+        now = time.time()
+        if now - accessed >= self.touch_seconds:
+            try:
+                conn.execute(
+                    'UPDATE cache_entries SET accessed = ? WHERE key = ? AND accessed < ?',
+                    (now, key, now - self.touch_seconds)
+                )
+            except sqlite3.OperationalError as e:
+                # Only LRU bookkeeping; a busy database must not turn a hit into a miss
+                logger.debug("Skipped the access time update of %s: %s", key, e)
+        return value
+
+    def put(self, key, value):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                (key, sqlite3.Binary(value), len(value), time.time())
+            )
+            self._evict(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache_entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM cache_entries ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM cache_entries WHERE key = ?', victims)
+
+    @contextmanager
+    def single_flight(self, key):
+        conn = self._connect()
+        owner = uuid.uuid4().hex
+        while True:
+            now = time.time()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('DELETE FROM cache_leases WHERE key = ? AND expires < ?', (key, now))
+                acquired = conn.execute(
+                    'INSERT OR IGNORE INTO cache_leases (key, owner, expires) VALUES (?, ?, ?)',
+                    (key, owner, now + self.lease_seconds)
+                ).rowcount == 1
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            if acquired:
+                break
+            # Another replica is computing; stop waiting as soon as its value lands
+            time.sleep(self.poll_seconds)
+            if conn.execute('SELECT 1 FROM cache_entries WHERE key = ?', (key,)).fetchone():
+                break
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    conn.execute('DELETE FROM cache_leases WHERE key = ? AND owner = ?', (key, owner))
+                except sqlite3.Error as e:
+                    # The lease expires on its own after lease_seconds
+                    logger.warning("Could not release the lease on %s: %s", key, e)
+
+
+def open_shared_cache(spec, max_bytes=512 * 1024 ** 2):
+    """Create a SharedCache from 'sqlite:///path/to/cache.db' or a directory path"""
+    if spec.startswith('sqlite:///'):
+        return SQLiteCache(spec[len('sqlite:///'):], max_bytes=max_bytes)
+    return FilesystemCache(spec, max_bytes=max_bytes)
+
+
+_backend = None
+
+
+def use_shared_cache(backend):
+    """Route every shared_cached function through backend (None turns the tier off)"""
+    global _backend
+    _backend = backend
+
+
+def _function_source(func):
+    """Bytes identifying what func does, constants included, like st.cache_data's hash"""
+    try:
+        return inspect.getsource(func).encode()
+    except (OSError, TypeError):  # No source on disk: the marshalled code covers co_consts recursively
+        return marshal.dumps(func.__code__)
+
+
+def shared_cached(namespace):
+    """Decorator caching a function's pickled result in the shared cache tier.
+
+    The key is derived from namespace, the function's source and every
+    argument not prefixed with an underscore, mirroring st.cache_data: pass
+    large inputs as `_df` alongside a content `version`. Stack it under
+    st.cache_data so each process still keeps its own in-memory copy.
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+        code_hash = hashlib.blake2b(_function_source(func), digest_size=8).hexdigest()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = _backend
+            if backend is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            hashed = [(name, value) for name, value in bound.arguments.items() if not name.startswith('_')]
+            key = hashlib.blake2b(f'{namespace}:{code_hash}:{hashed!r}'.encode(), digest_size=16).hexdigest()
+            return backend.get_or_compute(key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorate
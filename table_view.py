@@ -0,0 +1,79 @@
+import numpy as np
+import streamlit as st
+
+# ColorBrewer RdYlGn, the palette the table used through matplotlib
+_RDYLGN = np.array([
+    (165, 0, 38), (215, 48, 39), (244, 109, 67), (253, 174, 97), (254, 224, 139),
+    (255, 255, 191), (217, 239, 139), (166, 217, 106), (102, 189, 99), (26, 152, 80),
+    (0, 104, 55),
+], dtype=np.float64)
+
+# Same cut-off pandas' background_gradient uses to switch to light text
+_TEXT_LUMINANCE_THRESHOLD = 0.408
+
+
+def gradient_css(values, vmin, vmax):
+    """CSS for each value, coloured on the RdYlGn scale between vmin and vmax"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    span = vmax - vmin
+    position = np.clip((values - vmin) / span, 0, 1) if span else np.full(len(values), 0.5)
+    position[missing] = 0.5
+    stops = np.linspace(0, 1, len(_RDYLGN))
+    rgb = np.column_stack([np.interp(position, stops, _RDYLGN[:, i]) for i in range(3)])
+    linear = rgb / 255
+    linear = np.where(linear <= 0.03928, linear / 12.92, ((linear + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+    text = np.where(luminance < _TEXT_LUMINANCE_THRESHOLD, '#f1f1f1', '#000000')
+    rgb = rgb.round().astype(int)
+    return [
+        '' if m else f'background-color: #{r:02x}{g:02x}{b:02x}; color: {t}'
+        for (r, g, b), t, m in zip(rgb, text, missing)
+    ]
+
+
+def styled_window(window, scales):
+    """Style only the rows in window, using the colour scale of the whole table"""
+    styler = window.style
+    for column, (vmin, vmax) in scales.items():
+        styler = styler.apply(lambda s, vmin=vmin, vmax=vmax: gradient_css(s, vmin, vmax), subset=[column])
+    return styler
+
+
+def render_table(df, gradient_columns, key, page_size=1000, max_styled_rows=10_000, height=500, scales=None):
+    """Show df with a colour gradient on gradient_columns without styling every row.
+
+    In "Paged" mode only the visible page is styled, scaled to the min/max of
+    the whole frame so colours are comparable across pages. In "All rows"
+    mode the Styler is used while the frame has at most max_styled_rows rows;
+    above that the columns become progress bars drawn by the browser.
+    scales maps each gradient column to a precomputed (min, max).
+    """
+    if scales is None:
+        scales = {column: (float(df[column].min()), float(df[column].max())) for column in gradient_columns}
+    total_pages = max(1, -(-len(df) // page_size))
+
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        mode = st.radio("View", ["Paged", "All rows"], horizontal=True, key=f"{key}_mode", label_visibility="collapsed")
+
+    if mode == "Paged":
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key=f"{key}_page")
+        window = df.iloc[(page - 1) * page_size:page * page_size]
+        st.dataframe(styled_window(window, scales), use_container_width=True, height=height)
+        first_row = (page - 1) * page_size
+        if len(window):
+            st.caption(f"Rows {first_row + 1:,}–{first_row + len(window):,} of {len(df):,}")
+        else:
+            st.caption("No matching rows.")
+    elif len(df) <= max_styled_rows:
+        st.dataframe(styled_window(df, scales), use_container_width=True, height=height)
+    else:
+        column_config = {
+            column: st.column_config.ProgressColumn(column, format="%.0f", min_value=vmin, max_value=vmax)
+            for column, (vmin, vmax) in scales.items()
+        }
+        st.dataframe(df, use_container_width=True, height=height, column_config=column_config)
+        st.caption(f"Gradient disabled above {max_styled_rows:,} rows.")
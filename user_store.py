@@ -0,0 +1,379 @@
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Columns callers are allowed to select or write. Column names can't be bound
+# as SQL parameters, so anything outside this set is rejected up front.
+USER_COLUMNS = ('id', 'username', 'email', 'password', 'created_at')
+
+# Columns the user listing can be ordered by. Username is unique, so it doubles
+# as the tie-breaker that makes every keyset cursor unambiguous.
+SORT_COLUMNS = ('created_at', 'username')
+
+
+class UserExistsError(Exception):
+    """Raised when a write would duplicate an existing username"""
+
+
+def _is_unique_violation(error):
+    """Return True if a backend error comes from the username unique key"""
+    if isinstance(error, sqlite3.IntegrityError):
+        name = getattr(error, 'sqlite_errorname', '')
+        return name in ('SQLITE_CONSTRAINT_PRIMARYKEY', 'SQLITE_CONSTRAINT_UNIQUE') or 'UNIQUE' in str(error)
+    # PostgREST surfaces Postgres SQLSTATE codes, 23505 is unique_violation
+    return getattr(error, 'code', None) == '23505'
+
+
+def _check_sort(sort_by):
+    if sort_by not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort users by: {sort_by}")
+    return sort_by
+
+
+def _with_cursor_columns(columns, sort_by):
+    """Append the columns a keyset cursor needs, keeping the caller's order"""
+    return list(columns) + [c for c in (sort_by, 'username') if c not in columns]
+
+
+def page_cursor(row, sort_by):
+    """Build the keyset cursor that continues after row"""
+    return (row[sort_by], row['username'])
+
+
+def _postgrest_value(value):
+    """Double-quote a value for a PostgREST logic tree, so ',', '.', ':' and parentheses stay literal"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _check_columns(columns):
+    """Validate a list of column names against USER_COLUMNS"""
+    for column in columns:
+        if column not in USER_COLUMNS:
+            raise ValueError(f"Unknown user column: {column}")
+    return list(columns)
+
+
+class UserStore:
+    """Common interface for user storage backends"""
+
+    def get_user(self, username, columns):
+        """Return a dict with the requested columns for username, or None"""
+        raise NotImplementedError
+
+    def username_exists(self, username):
+        """Return True if username is already taken"""
+        return self.get_user(username, ['username']) is not None
+
+    def insert_user(self, data):
+        """Insert a new user row, raising UserExistsError if the username is taken.
+
+        Uniqueness is enforced by the table's key, so there is no separate
+        existence check and no window for two sign-ups to race.
+        """
+        raise NotImplementedError
+
+    def update_user(self, username, data, expected=None):
+        """Update the row for username with the values in data.
+
+        If expected is given, the row is only updated while its columns still
+        hold those values. Returns True if a row was updated. Renaming onto a
+        username that is already taken raises UserExistsError.
+        """
+        raise NotImplementedError
+
+    def list_users(self, columns):
+        """Return every user as a list of dicts"""
+        raise NotImplementedError
+
+    def list_users_page(self, columns, sort_by='created_at', descending=True, after=None, limit=50):
+        """Return up to limit users ordered by sort_by, starting after the cursor.
+
+        Paging is keyset based: `after` is the cursor of the last row of the
+        previous page (see page_cursor), so every page is an index range scan
+        instead of an ever-growing OFFSET.
+        """
+        raise NotImplementedError
+
+    def count_users(self):
+        """Return the number of registered users"""
+        raise NotImplementedError
+
+    def latest_user(self):
+        """Return the username of the most recent registration, or None"""
+        raise NotImplementedError
+
+
+class SupabaseUserStore(UserStore):
+    """User store backed by the Supabase `users` table"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_user(self, username, columns):
+        columns = _check_columns(columns)
+        response = self.client.table('users').select(', '.join(columns)).eq('username', username).execute()
+        return response.data[0] if response.data else None
+
+    def insert_user(self, data):
+        _check_columns(data)
+        try:
+            self.client.table('users').insert(data).execute()
+        except Exception as e:
+            if _is_unique_violation(e):
+                raise UserExistsError(data.get('username')) from e
+            raise
+
+    def update_user(self, username, data, expected=None):
+        _check_columns(data)
+        query = self.client.table('users').update(data).eq('username', username)
+        for column, value in (expected or {}).items():
+            query = query.eq(_check_columns([column])[0], value)
+        try:
+            return bool(query.execute().data)
+        except Exception as e:
+            if _is_unique_violation(e):
+                raise UserExistsError(data.get('username')) from e
+            raise
+
+    def list_users(self, columns):
+        columns = _check_columns(columns)
+        return self.client.table('users').select(', '.join(columns)).execute().data
+
+    def list_users_page(self, columns, sort_by='created_at', descending=True, after=None, limit=50):
+        sort_by = _check_sort(sort_by)
+        columns = _check_columns(_with_cursor_columns(columns, sort_by))
+        query = self.client.table('users').select(', '.join(columns))
+        if after is not None:
+            value, username = after
+            op = 'lt' if descending else 'gt'
+            if sort_by == 'username':
+                query = query.filter('username', op, username)
+            else:
+                # Plain filters take the value literally, but inside a logic tree it must be quoted
+                value, username = _postgrest_value(value), _postgrest_value(username)
+                query = query.or_(f'{sort_by}.{op}.{value},and({sort_by}.eq.{value},username.{op}.{username})')
+        query = query.order(sort_by, desc=descending)
+        if sort_by != 'username':
+            query = query.order('username', desc=descending)
+        return query.limit(limit).execute().data
+
+    def count_users(self):
+        return self.client.table('users').select('username', count='exact', head=True).execute().count
+
+    def latest_user(self):
+        response = self.client.table('users').select('username').order('created_at', desc=True).limit(1).execute()
+        return response.data[0]['username'] if response.data else None
+
+
+class SQLiteUserStore(UserStore):
+    """User store backed by a local SQLite file.
+
+    Connections are opened once in WAL mode and handed out from a small pool,
+    so concurrent Streamlit sessions can read while another one writes. All
+    statements are parameterized and built from a fixed set of columns, which
+    lets sqlite3's per-connection statement cache reuse the prepared plans.
+    """
+
+    def __init__(self, path, pool_size=4, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS users_created_at ON users (created_at, username)')
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=256,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a with-block"""
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @staticmethod
+    def _select_list(columns):
+        # SQLite has no `id` column, expose the implicit rowid under that name
+        return ', '.join('rowid AS id' if c == 'id' else c for c in _check_columns(columns))
+
+    def get_user(self, username, columns):
+        sql = f'SELECT {self._select_list(columns)} FROM users WHERE username = ?'
+        with self.connection() as conn:
+            row = conn.execute(sql, (username,)).fetchone()
+        return dict(row) if row else None
+
+    def insert_user(self, data):
+        columns = _check_columns(data)
+        sql = f"INSERT INTO users ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        try:
+            with self.connection() as conn:
+                conn.execute(sql, [data[c] for c in columns])
+        except sqlite3.IntegrityError as e:
+            if _is_unique_violation(e):
+                raise UserExistsError(data.get('username')) from e
+            raise
+
+    def update_user(self, username, data, expected=None):
+        columns = _check_columns(data)
+        conditions = _check_columns(expected or {})
+        sql = f"UPDATE users SET {', '.join(f'{c} = ?' for c in columns)} WHERE username = ?"
+        sql += ''.join(f' AND {c} = ?' for c in conditions)
+        params = [data[c] for c in columns] + [username] + [expected[c] for c in conditions]
+        try:
+            with self.connection() as conn:
+                return conn.execute(sql, params).rowcount > 0
+        except sqlite3.IntegrityError as e:
+            if _is_unique_violation(e):
+                raise UserExistsError(data.get('username')) from e
+            raise
+
+    def list_users(self, columns):
+        sql = f'SELECT {self._select_list(columns)} FROM users'
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(sql)]
+
+    def list_users_page(self, columns, sort_by='created_at', descending=True, after=None, limit=50):
+        columns = _with_cursor_columns(columns, _check_sort(sort_by))
+        direction = 'DESC' if descending else 'ASC'
+        params = []
+        sql = f'SELECT {self._select_list(columns)} FROM users'
+        if after is not None:
+            op = '<' if descending else '>'
+            if sort_by == 'username':
+                sql += f' WHERE username {op} ?'
+                params.append(after[1])
+            else:
+                sql += f' WHERE ({sort_by}, username) {op} (?, ?)'
+                params.extend(after)
+        sql += f' ORDER BY {sort_by} {direction}'
+        if sort_by != 'username':
+            sql += f', username {direction}'
+        sql += ' LIMIT ?'
+        params.append(limit)
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def count_users(self):
+        with self.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def latest_user(self):
+        sql = 'SELECT username FROM users ORDER BY created_at DESC, rowid DESC LIMIT 1'
+        with self.connection() as conn:
+            row = conn.execute(sql).fetchone()
+        return row['username'] if row else None
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+
+
+class MemoryUserStore(UserStore):
+    """In-process stand-in for a real backend, for tests and benchmarks.
+
+    latency adds a sleep to every call and failure_rate makes that fraction
+    of calls raise ConnectionError, to exercise timeouts and retries without
+    a network.
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._next_id = 1
+
+    def _simulate(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise ConnectionError("Simulated backend failure")
+
+    @staticmethod
+    def _project(row, columns):
+        return {c: row[c] for c in _check_columns(columns)}
+
+    def get_user(self, username, columns):
+        self._simulate()
+        row = self._rows.get(username)
+        return self._project(row, columns) if row else None
+
+    def insert_user(self, data):
+        _check_columns(data)
+        self._simulate()
+        with self._lock:
+            if data['username'] in self._rows:
+                raise UserExistsError(data['username'])
+            row = {'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), **data, 'id': self._next_id}
+            self._rows[data['username']] = row
+            self._next_id += 1
+
+    def update_user(self, username, data, expected=None):
+        _check_columns(data)
+        self._simulate()
+        with self._lock:
+            row = self._rows.get(username)
+            if row is None or any(row[c] != v for c, v in (expected or {}).items()):
+                return False
+            new_name = data.get('username', username)
+            if new_name != username and new_name in self._rows:
+                raise UserExistsError(new_name)
+            row.update(data)
+            self._rows[new_name] = self._rows.pop(username)
+            return True
+
+    def list_users(self, columns):
+        self._simulate()
+        return [self._project(row, columns) for row in list(self._rows.values())]
+
+    def list_users_page(self, columns, sort_by='created_at', descending=True, after=None, limit=50):
+        sort_by = _check_sort(sort_by)
+        columns = _with_cursor_columns(columns, sort_by)
+        self._simulate()
+        rows = sorted(self._rows.values(), key=lambda row: page_cursor(row, sort_by), reverse=descending)
+        if after is not None:
+            after = tuple(after)
+            rows = [row for row in rows if (page_cursor(row, sort_by) < after if descending else page_cursor(row, sort_by) > after)]
+        return [self._project(row, columns) for row in rows[:limit]]
+
+    def count_users(self):
+        self._simulate()
+        return len(self._rows)
+
+    def latest_user(self):
+        self._simulate()
+        if not self._rows:
+            return None
+        return max(self._rows.values(), key=lambda row: (row['created_at'], row['id']))['username']